@@ -0,0 +1,168 @@
+"""Archive of every season's league tables and the all-time tables built from it.
+
+Each season is kept as Parquet files in data/archive/<season>/, together with
+a one-row-per-manager season summary. The all-time tables the app reads
+(alltime_seasons and alltime_managers) are built from those summaries alone,
+so they stay cheap however many seasons pile up. The FPL API only serves the
+current season, which initial_setup.py archives on every run; earlier seasons
+can be imported from an old copy of the data directory, e.g.
+
+    python archive.py --import old-data --season 2024-25
+"""
+
+import argparse
+import os
+import shutil
+from contextlib import closing
+
+import pandas as pd
+
+from data_store import (
+    DATA_DIR,
+    link_files,
+    parse_finished_events,
+    read_table,
+    table_path,
+    write_table,
+)
+import league_db
+from league_analytics import (
+    SEASON_SUMMARY_COLUMNS,
+    alltime_summary,
+    build_league_tables,
+    manager_season_stats,
+    season_summary,
+)
+
+ARCHIVE_DIR = "archive"  # Under the data directory, one subdirectory per season
+RAW_TABLES = ["weekly_scores", "chip_usage", "jager_cup_matches", "gameweek_info"]
+DERIVED_TABLES = ["weekly_winners", "event_ranks"]
+SUMMARY_TABLE = "season_summary"
+
+
+def archive_dir(data_dir=DATA_DIR):
+    return os.path.join(data_dir, ARCHIVE_DIR)
+
+
+def archived_seasons(data_dir=DATA_DIR):
+    """Labels of the archived seasons, oldest first."""
+    directory = archive_dir(data_dir)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        season
+        for season in os.listdir(directory)
+        if os.path.isfile(table_path(SUMMARY_TABLE, os.path.join(directory, season)))
+    )
+
+
+def read_optional(name, data_dir):
+    try:
+        return read_table(name, data_dir)
+    except FileNotFoundError:
+        return pd.DataFrame()
+
+
+def has_table(name, data_dir):
+    return any(os.path.exists(table_path(name, data_dir, ext)) for ext in ("parquet", "csv"))
+
+
+def archive_season(season, source_dir=DATA_DIR, data_dir=DATA_DIR):
+    """Replace the archived copy of a season with the tables in source_dir.
+
+    Parquet tables are hard-linked, CSV-only ones (e.g. from older data
+    directories) converted. The season's summary is written alongside; its
+    per-manager statistics are queried from source_dir's league database, so
+    the weekly scores aren't loaded. Only a directory without one (e.g. an old
+    season being imported) has its weekly scores read, to build the summary and
+    any derived tables it lacks.
+    """
+    if not has_table("weekly_scores", source_dir):
+        print(f"No weekly scores in {source_dir}, season {season} not archived")
+        return False
+
+    target = os.path.join(archive_dir(data_dir), season)
+    staging = f"{target}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    gw_info = read_optional("gameweek_info", source_dir)
+    finished_events = (
+        parse_finished_events(gw_info["finished_events"].iloc[0]) if not gw_info.empty else None
+    )
+    for name in RAW_TABLES + DERIVED_TABLES:
+        if os.path.exists(table_path(name, source_dir)):
+            link_files([f"{name}.parquet"], source_dir, staging)
+        elif name in RAW_TABLES:
+            table = read_optional(name, source_dir)
+            if not table.empty:
+                write_table(table, name, staging, csv=False)
+
+    df_cup = read_optional("jager_cup_matches", staging)
+    db = league_db.db_path(source_dir)
+    if os.path.exists(db) and has_table("weekly_winners", staging):
+        df_weekly_winner = read_table("weekly_winners", staging)
+        with closing(league_db.connect(db)) as conn:
+            df_manager_stats = league_db.manager_season_stats(conn)
+    else:
+        derived = build_league_tables(
+            read_table("weekly_scores", staging),
+            read_optional("chip_usage", staging),
+            df_cup,
+            finished_events,
+        )
+        for name in DERIVED_TABLES:
+            if not has_table(name, staging):
+                write_table(derived[name], name, staging, csv=False)
+        df_weekly_winner = derived["weekly_winners"]
+        df_manager_stats = manager_season_stats(derived["event_ranks"])
+
+    summary = season_summary(
+        season, df_weekly_winner, df_manager_stats, df_cup, finished_events
+    )
+    write_table(summary, SUMMARY_TABLE, staging, csv=False)
+
+    # Swap the new copy in, then drop the old one, and any left by a crashed run
+    shutil.rmtree(f"{target}.old", ignore_errors=True)
+    if os.path.isdir(target):
+        os.replace(target, f"{target}.old")
+    os.replace(staging, target)
+    shutil.rmtree(f"{target}.old", ignore_errors=True)
+    return True
+
+
+def save_alltime_tables(data_dir=DATA_DIR):
+    """Write alltime_seasons and alltime_managers from the archived season summaries."""
+    summaries = [
+        read_table(SUMMARY_TABLE, os.path.join(archive_dir(data_dir), season))
+        for season in archived_seasons(data_dir)
+    ]
+    if not summaries:
+        return
+    df_seasons = pd.concat(summaries, ignore_index=True)[SEASON_SUMMARY_COLUMNS]
+    df_seasons["player_name"] = df_seasons["player_name"].astype(str)
+    write_table(df_seasons, "alltime_seasons", data_dir, csv=False)
+    write_table(alltime_summary(df_seasons), "alltime_managers", data_dir, csv=False)
+    print(f"Successfully updated the all-time tables in {data_dir} ({len(summaries)} seasons)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Archive seasons and rebuild the all-time tables.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--import", dest="source_dir", help="Data directory holding a season to archive")
+    parser.add_argument("--season", help="Season label of the imported data, such as 2024-25")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.source_dir:
+        if not args.season:
+            raise SystemExit("--season is required with --import")
+        if archive_season(args.season, args.source_dir, args.data_dir):
+            print(f"Archived season {args.season} from {args.source_dir}")
+    save_alltime_tables(args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""End-to-end ingestion benchmark against the offline FPL API stand-in.
+
+Times get_league_data and get_jager_cup_data on synthetic leagues and reports
+wall time, request count and peak traced memory, e.g.
+
+    python benchmarks/bench_ingest.py --sizes 20 500 10000 --latency 0.02
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import initial_setup  # noqa: E402
+from fake_fpl import FakeFPL, install  # noqa: E402
+
+DEFAULT_SIZES = [20, 500, 10_000]
+
+
+def run_once(fake, func, latency, requests_per_second, trace_memory):
+    """Run func against a fresh fake client and response cache."""
+    cache_dir = tempfile.mkdtemp(prefix="fpl-bench-cache-")
+    adapter = install(fake, latency, requests_per_second, cache_dir)
+    try:
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return result, elapsed, adapter.request_count, peak
+
+
+def benchmark(name, fake, func, args):
+    result, elapsed, count, _ = run_once(
+        fake, func, args.latency, args.requests_per_second, False
+    )
+    peak = None
+    if not args.no_memory:
+        # Memory is traced in a separate run as tracing slows everything down
+        peak = run_once(fake, func, args.latency, args.requests_per_second, True)[3]
+    rows = sum(len(df) for df in result) if isinstance(result, tuple) else len(result)
+    return {
+        "benchmark": name,
+        "managers": fake.managers,
+        "seconds": round(elapsed, 3),
+        "requests": count,
+        "peak_mib": round(peak / 2**20, 1) if peak is not None else None,
+        "rows": rows,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="League sizes in managers")
+    parser.add_argument("--current-event", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds slept per fake request")
+    parser.add_argument("--requests-per-second", type=float, default=None, help="Client rate limit (default: unlimited)")
+    parser.add_argument("--max-workers", type=int, default=initial_setup.MAX_WORKERS)
+    parser.add_argument("--picks-for-chips", action="store_true", help="Probe every gameweek's picks for chips")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc runs")
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for size in args.sizes:
+        fake = FakeFPL(managers=size, current_event=args.current_event)
+        results.append(
+            benchmark(
+                "get_league_data",
+                fake,
+                lambda: initial_setup.get_league_data(
+                    fake.league_id, args.max_workers, args.picks_for_chips
+                ),
+                args,
+            )
+        )
+        results.append(
+            benchmark(
+                "get_jager_cup_data",
+                fake,
+                lambda: initial_setup.get_jager_cup_data(
+                    fake.cup_league_id, max_workers=args.max_workers
+                ),
+                args,
+            )
+        )
+        print(json.dumps(results[-2]))
+        print(json.dumps(results[-1]))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Rendering benchmark for the Streamlit pages, run headless with AppTest.
+
+For each league size a synthetic season is ingested from the offline FPL API
+stand-in into a temporary data directory, then every page is timed on a cold
+run (empty Streamlit caches), a warm rerun and a rerun after switching the
+selected manager, e.g.
+
+    python benchmarks/bench_pages.py --sizes 20 200 2000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+# The pages read DATA_DIR at import time, so point it at a scratch directory first
+os.environ.setdefault("FPL_DATA_DIR", tempfile.mkdtemp(prefix="fpl-bench-data-"))
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import initial_setup  # noqa: E402
+from data_store import DATA_DIR  # noqa: E402
+from fake_fpl import FakeFPL, install  # noqa: E402
+
+DEFAULT_SIZES = [20, 200, 2000]
+PAGES = ["weekly_winner", "chip_usage", "jager_cup", "prizes", "all_time"]
+# Pages whose output depends on the selected manager
+USER_PAGES = {"weekly_winner", "chip_usage", "all_time"}
+
+
+def page_app(page, default_user, is_mobile):
+    """Render one page like main_file.py does; AppTest runs this as a script."""
+    import streamlit as st
+
+    st.session_state.setdefault("is_mobile", is_mobile)
+    selected_user = st.session_state.get("selected_user", default_user)
+    if page == "weekly_winner":
+        from streamlit_pages.weekly_winnings import show_weekly_winner_page
+
+        show_weekly_winner_page(selected_user)
+    elif page == "chip_usage":
+        from streamlit_pages.chip_usage import show_chip_usage_page
+
+        show_chip_usage_page(selected_user)
+    elif page == "jager_cup":
+        from streamlit_pages.jager_cup import run_cup_page
+
+        run_cup_page()
+    elif page == "prizes":
+        from streamlit_pages.prizes import show_prizes_page
+
+        show_prizes_page()
+    elif page == "all_time":
+        from streamlit_pages.all_time import show_all_time_page
+
+        show_all_time_page(selected_user)
+
+
+def build_dataset(size, current_event, cup_start_event):
+    """Ingest a synthetic league of size managers into DATA_DIR."""
+    fake = FakeFPL(managers=size, current_event=current_event, cup_start_event=cup_start_event)
+    install(fake)
+    with contextlib.redirect_stdout(io.StringIO()):
+        initial_setup.ingest(
+            classic_leagues=[fake.league_id],
+            h2h_leagues=[fake.cup_league_id],
+            data_dir=DATA_DIR,
+            partitioned=False,
+            incremental=False,
+        )
+    return [fake.entry(entry_id)["player_name"].title() for entry_id in fake.entry_ids[:2]]
+
+
+def timed_run(at, timeout):
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"Page raised: {[e.value for e in at.exception]}")
+    return round(elapsed, 3)
+
+
+def benchmark_page(page, users, is_mobile, timeout):
+    st.cache_data.clear()
+    at = AppTest.from_function(page_app, args=(page, users[0], is_mobile), default_timeout=timeout)
+    result = {"page": page, "cold_seconds": timed_run(at, timeout)}
+    result["warm_seconds"] = timed_run(at, timeout)
+    if page in USER_PAGES:
+        at.session_state["selected_user"] = users[1]
+        result["user_switch_seconds"] = timed_run(at, timeout)
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="League sizes in managers")
+    parser.add_argument("--pages", nargs="+", choices=PAGES, default=PAGES)
+    parser.add_argument("--current-event", type=int, default=38)
+    parser.add_argument("--cup-start-event", type=int, default=34)
+    parser.add_argument("--mobile", action="store_true", help="Render the mobile layouts")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed per script run")
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # prize_fund.csv is read relative to the repository root, like in the app
+    os.chdir(REPO_DIR)
+    results = []
+    for size in args.sizes:
+        users = build_dataset(size, args.current_event, args.cup_start_event)
+        for page in args.pages:
+            result = dict(managers=size, **benchmark_page(page, users, args.mobile, args.timeout))
+            results.append(result)
+            print(json.dumps(result))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Offline stand-in for the FPL API, served through a requests transport adapter.
+
+FakeFPL generates a synthetic season (a classic league and a knockout H2H cup of
+any size) deterministically from a seed, and FakeFPLAdapter answers the
+endpoints initial_setup.py uses with it. install() routes the shared FPL client
+to the fake, so the ingestion code runs unchanged without network access.
+"""
+
+import json
+import random
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+import fpl_cache
+import fpl_client
+
+FPL_HOST = "https://fantasy.premierleague.com/"
+PAGE_SIZE = 50  # Results per standings / H2H matches page, as on the real API
+CHIPS = ["wildcard", "bboost", "3xc", "freehit"]
+
+
+class FakeFPL:
+    """Synthetic FPL season with one classic league and one H2H cup league."""
+
+    def __init__(
+        self,
+        managers=20,
+        current_event=20,
+        league_id=43344,
+        cup_league_id=3023235,
+        cup_start_event=20,
+        season_start_year=2025,
+        seed=0,
+    ):
+        self.managers = managers
+        self.current_event = current_event
+        self.league_id = league_id
+        self.cup_league_id = cup_league_id
+        self.cup_start_event = cup_start_event
+        self.season_start_year = season_start_year
+        self.seed = seed
+        self.entry_ids = [100000 + i for i in range(managers)]
+        self._entry_set = set(self.entry_ids)
+        self._cup_matches = None
+
+    def entry(self, entry_id):
+        i = entry_id - 100000
+        return {
+            "entry": entry_id,
+            "player_name": f"manager {i}",
+            "entry_name": f"team {i}",
+        }
+
+    def bootstrap(self):
+        first_deadline = datetime(self.season_start_year, 8, 15, 17, 30)
+        events = [
+            {
+                "id": gw,
+                "is_current": gw == self.current_event,
+                "finished": gw < self.current_event,
+                "deadline_time": (first_deadline + timedelta(weeks=gw - 1)).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                ),
+            }
+            for gw in range(1, 39)
+        ]
+        elements = [{"id": i, "web_name": f"player {i}"} for i in range(1, 601)]
+        return {"events": events, "elements": elements}
+
+    def standings(self, league_id, page):
+        if league_id != self.league_id:
+            return None
+        start = (page - 1) * PAGE_SIZE
+        ids = self.entry_ids[start : start + PAGE_SIZE]
+        return {
+            "standings": {
+                "has_next": start + PAGE_SIZE < self.managers,
+                "page": page,
+                "results": [self.entry(entry_id) for entry_id in ids],
+            }
+        }
+
+    def points(self, entry_id, gw):
+        return random.Random(self.seed * 1_000_003 + entry_id * 41 + gw).randint(15, 110)
+
+    def chips(self, entry_id):
+        rng = random.Random(self.seed + entry_id)
+        gameweeks = rng.sample(range(1, self.current_event + 1), min(4, self.current_event))
+        return [
+            {"name": chip, "time": "", "event": gw}
+            for chip, gw in zip(CHIPS, gameweeks)
+            if rng.random() < 0.6
+        ]
+
+    def history(self, entry_id):
+        if entry_id not in self._entry_set:
+            return None
+        current = []
+        total = 0
+        for gw in range(1, self.current_event + 1):
+            points = self.points(entry_id, gw)
+            total += points
+            current.append(
+                {
+                    "event": gw,
+                    "points": points,
+                    "total_points": total,
+                    "rank": entry_id % 1000 + gw,
+                    "rank_sort": entry_id % 1000 + gw,
+                    "overall_rank": entry_id * 3 + gw,
+                    "percentile_rank": entry_id % 100,
+                    "bank": gw % 10,
+                    "value": 1000 + gw,
+                    "event_transfers": gw % 3,
+                    "event_transfers_cost": 4 if gw % 7 == 0 else 0,
+                    "points_on_bench": gw % 12,
+                }
+            )
+        return {"current": current, "past": [], "chips": self.chips(entry_id)}
+
+    def picks(self, entry_id, gw):
+        if entry_id not in self._entry_set or gw > self.current_event:
+            return None
+        rng = random.Random(self.seed + entry_id * 100 + gw)
+        elements = rng.sample(range(1, 601), 15)
+        chip = next((c["name"] for c in self.chips(entry_id) if c["event"] == gw), None)
+        captain = 3 if chip == "3xc" else 2
+        bench = 1 if chip == "bboost" else 0
+        return {
+            "active_chip": chip,
+            "entry_history": {
+                "event": gw,
+                "points": self.points(entry_id, gw),
+                "event_transfers_cost": 4 if gw % 7 == 0 else 0,
+            },
+            "picks": [
+                {
+                    "element": element,
+                    "position": position,
+                    "multiplier": (captain if position == 1 else 1) if position <= 11 else bench,
+                    "is_captain": position == 1,
+                    "is_vice_captain": position == 2,
+                }
+                for position, element in enumerate(elements, 1)
+            ],
+        }
+
+    def live(self, gw):
+        """Points of every player in a gameweek so far."""
+        if gw > self.current_event:
+            return None
+        rng = random.Random(self.seed * 7 + gw)
+        elements = []
+        for element_id in range(1, 601):
+            minutes = rng.choice([0, 0, 45, 90, 90])
+            elements.append(
+                {
+                    "id": element_id,
+                    "stats": {
+                        "minutes": minutes,
+                        "total_points": rng.randint(1, 12) if minutes else 0,
+                    },
+                }
+            )
+        return {"elements": elements}
+
+    def cup_matches(self):
+        """Knockout rounds from cup_start_event, one round per gameweek."""
+        if self._cup_matches is not None:
+            return self._cup_matches
+        matches = []
+        remaining = list(self.entry_ids)
+        gw = self.cup_start_event
+        while len(remaining) > 1 and gw <= min(self.current_event + 1, 38):
+            size = len(remaining)
+            stage = {2: "Final", 4: "Semi-finals", 8: "Quarter-finals"}.get(
+                size, f"Round of {size}"
+            )
+            winners = []
+            for i in range(0, size, 2):
+                entry_1 = self.entry(remaining[i])
+                entry_2 = self.entry(remaining[i + 1]) if i + 1 < size else None
+                played = gw <= self.current_event
+                points_1 = self.points(entry_1["entry"], gw) if played else 0
+                points_2 = self.points(entry_2["entry"], gw) if played and entry_2 else 0
+                winner = None
+                if entry_2 is None:
+                    winner = entry_1["entry"]
+                elif played:
+                    winner = entry_1["entry"] if points_1 >= points_2 else entry_2["entry"]
+                winners.append(winner or entry_1["entry"])
+                matches.append(
+                    {
+                        "event": gw,
+                        "knockout_name": stage,
+                        "entry_1_entry": entry_1["entry"],
+                        "entry_1_name": entry_1["entry_name"],
+                        "entry_1_player_name": entry_1["player_name"],
+                        "entry_1_points": points_1,
+                        "entry_2_entry": entry_2["entry"] if entry_2 else None,
+                        "entry_2_name": entry_2["entry_name"] if entry_2 else None,
+                        "entry_2_player_name": entry_2["player_name"] if entry_2 else None,
+                        "entry_2_points": points_2,
+                        "winner": winner,
+                        "is_bye": entry_2 is None,
+                    }
+                )
+            remaining = winners
+            gw += 1
+        # Latest round first, as the real API returns them
+        self._cup_matches = sorted(matches, key=lambda m: -m["event"])
+        return self._cup_matches
+
+    def h2h_matches(self, league_id, page, event=None):
+        if league_id != self.cup_league_id:
+            return None
+        matches = self.cup_matches()
+        if event is not None:
+            matches = [m for m in matches if m["event"] == event]
+        start = (page - 1) * PAGE_SIZE
+        return {
+            "has_next": start + PAGE_SIZE < len(matches),
+            "page": page,
+            "results": matches[start : start + PAGE_SIZE],
+        }
+
+
+ROUTES = [
+    (r"/api/bootstrap-static/$", lambda fake, m, q: fake.bootstrap()),
+    (
+        r"/api/leagues-classic/(\d+)/standings/$",
+        lambda fake, m, q: fake.standings(int(m[1]), int(q.get("page_standings", 1))),
+    ),
+    (r"/api/entry/(\d+)/history/$", lambda fake, m, q: fake.history(int(m[1]))),
+    (
+        r"/api/entry/(\d+)/event/(\d+)/picks/$",
+        lambda fake, m, q: fake.picks(int(m[1]), int(m[2])),
+    ),
+    (r"/api/event/(\d+)/live/$", lambda fake, m, q: fake.live(int(m[1]))),
+    (
+        r"/api/leagues-h2h-matches/league/(\d+)/$",
+        lambda fake, m, q: fake.h2h_matches(
+            int(m[1]),
+            int(q.get("page", 1)),
+            int(q["event"]) if "event" in q else None,
+        ),
+    ),
+]
+
+
+class FakeFPLAdapter(BaseAdapter):
+    """requests transport adapter answering FPL API calls from a FakeFPL.
+
+    latency seconds are slept per request (concurrently across threads) to
+    mimic network round trips; requests are counted per endpoint.
+    """
+
+    def __init__(self, fake, latency=0.0):
+        super().__init__()
+        self.fake = fake
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    @property
+    def request_count(self):
+        return sum(self.counts.values())
+
+    def reset_counts(self):
+        with self.lock:
+            self.counts.clear()
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        payload, endpoint = None, "unknown"
+        for pattern, handler in ROUTES:
+            match = re.match(pattern, url.path)
+            if match:
+                endpoint = pattern
+                payload = handler(self.fake, match, query)
+                break
+        with self.lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "application/json"
+        if payload is None:
+            response.status_code = 404
+            response._content = b'{"detail": "Not found."}'
+        else:
+            response.status_code = 200
+            response._content = json.dumps(payload).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def install(fake, latency=0.0, requests_per_second=None, cache_dir=None):
+    """Point the shared FPL client at a fake API and return its adapter.
+
+    The rate limit is lifted unless requests_per_second is given, and responses
+    are cached in cache_dir (a fresh temporary directory by default).
+    """
+    rate = requests_per_second or float("inf")
+    client = fpl_client.FPLClient(requests_per_second=rate, burst=max(rate, 1))
+    adapter = FakeFPLAdapter(fake, latency)
+    client.session.mount(FPL_HOST, adapter)
+    fpl_client._client = client
+
+    fpl_cache.CACHE_DIR = cache_dir or tempfile.mkdtemp(prefix="fpl-http-cache-")
+    fpl_cache._cache_size = None
+    return adapter
@@ -0,0 +1,98 @@
+"""Checkpoint journal that lets an interrupted streaming crawl resume."""
+
+import os
+import sqlite3
+import threading
+
+JOURNAL_NAME = "crawl_journal.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    league_id INTEGER PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    league_id INTEGER NOT NULL,
+    entry_id INTEGER NOT NULL,
+    endpoint TEXT NOT NULL,
+    event INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    PRIMARY KEY (league_id, entry_id, endpoint, event)
+);
+CREATE TABLE IF NOT EXISTS compacted (
+    league_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (league_id, name)
+);
+"""
+
+
+class CrawlJournal:
+    """SQLite journal of the (entry, endpoint, gameweek) units a crawl has saved.
+
+    A unit is recorded together with the part file its rows were written to, so
+    the journal never claims work whose data is not on disk.
+    """
+
+    def __init__(self, data_dir):
+        os.makedirs(data_dir, exist_ok=True)
+        self.path = os.path.join(data_dir, JOURNAL_NAME)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _write(self, sql, rows):
+        with self.lock, self.conn:
+            self.conn.executemany(sql, rows)
+
+    def start(self, league_id, signature):
+        """Begin a league's crawl, or resume it if the last one had the same signature.
+
+        Returns True when resuming; otherwise any stale progress is discarded.
+        """
+        rows = self._query("SELECT signature FROM runs WHERE league_id = ?", (league_id,))
+        if rows and rows[0][0] == signature:
+            return True
+        self.finish(league_id)
+        self._write("INSERT INTO runs VALUES (?, ?)", [(league_id, signature)])
+        return False
+
+    def done_entries(self, league_id, endpoint="history"):
+        rows = self._query(
+            "SELECT entry_id FROM units WHERE league_id = ? AND endpoint = ?",
+            (league_id, endpoint),
+        )
+        return {entry_id for (entry_id,) in rows}
+
+    def saved_parts(self, league_id):
+        rows = self._query(
+            "SELECT DISTINCT part FROM units WHERE league_id = ?", (league_id,)
+        )
+        return {part for (part,) in rows}
+
+    def record_batch(self, league_id, part, units):
+        """Record the (entry_id, endpoint, event) units saved in a part file."""
+        self._write(
+            "INSERT OR REPLACE INTO units VALUES (?, ?, ?, ?, ?)",
+            [(league_id, entry_id, endpoint, event, part) for entry_id, endpoint, event in units],
+        )
+
+    def compacted_tables(self, league_id):
+        rows = self._query("SELECT name FROM compacted WHERE league_id = ?", (league_id,))
+        return {name for (name,) in rows}
+
+    def mark_compacted(self, league_id, name):
+        self._write("INSERT OR REPLACE INTO compacted VALUES (?, ?)", [(league_id, name)])
+
+    def finish(self, league_id):
+        """Forget a league's progress once its tables are complete."""
+        with self.lock, self.conn:
+            for table in ("runs", "units", "compacted"):
+                self.conn.execute(f"DELETE FROM {table} WHERE league_id = ?", (league_id,))
+
+    def close(self):
+        self.conn.close()
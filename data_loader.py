@@ -0,0 +1,308 @@
+"""Shared data access for the Streamlit pages, cached until the files change.
+
+Tables are read from the newest copy of the data directory (see
+data_store.latest_data_dir): a published snapshot, or the directory itself
+when its tables are newer. pin_data_version() keeps a script run on one copy
+throughout; the public loaders resolve the directory once and hand the
+resolved path to the helpers ending in _in.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+import pandas as pd
+import streamlit as st
+
+from data_store import (
+    DATA_DIR,
+    latest_data_dir,
+    parse_finished_events,
+    read_table,
+    refresh_dir,
+    table_path,
+)
+from instrumentation import RUN_REPORT_NAME
+import league_db
+from league_analytics import build_league_tables, cup_view_model, top_finishes
+
+PRIZE_FUND_PATH = "prize_fund.csv"
+_league_db_lock = threading.Lock()  # One rebuild of a league database at a time
+
+
+def file_version(path):
+    """Return a cheap version key for a file (inode, mtime and size), or None if missing.
+
+    Snapshots hard-link unchanged tables, so those keep their version (and
+    their cached copy) from one snapshot to the next.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_dev}-{stat.st_ino}-{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def pin_data_version(data_dir=DATA_DIR):
+    """Read the newest copy of data_dir for the rest of this script run.
+
+    Call at the top of the script, so every table of a page comes from the same
+    refresh even if a new snapshot is published halfway through the run.
+    """
+    st.session_state[f"data_source:{data_dir}"] = latest_data_dir(data_dir)
+
+
+def source_dir(data_dir=DATA_DIR):
+    """Directory the tables of data_dir are read from: the pinned or newest copy of it."""
+    key = f"data_source:{data_dir}"
+    directory = st.session_state[key] if key in st.session_state else None
+    if directory is None or not os.path.isdir(directory):
+        # Not pinned, or the pinned snapshot has been deleted since
+        directory = latest_data_dir(data_dir)
+    return directory
+
+
+def table_version(name, data_dir=DATA_DIR):
+    """Return the version of the file read_table would load for a table."""
+    for ext in ("parquet", "csv"):
+        version = file_version(table_path(name, data_dir, ext))
+        if version is not None:
+            return version
+    return None
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _load_table(name, version, _data_dir):
+    # Keyed by the file version only, so snapshots sharing a file share the entry
+    return read_table(name, _data_dir)
+
+
+def table_in(name, directory):
+    """Load a table of an already resolved directory; raises FileNotFoundError if missing."""
+    version = table_version(name, directory)
+    if version is None:
+        raise FileNotFoundError(f"No data found for table '{name}' in {directory}")
+    return _load_table(name, version, directory)
+
+
+def load_table(name, data_dir=DATA_DIR):
+    """Load a table once per file version; raises FileNotFoundError if missing."""
+    return table_in(name, source_dir(data_dir))
+
+
+def load_weekly_scores():
+    return load_table("weekly_scores")
+
+
+def load_chip_usage():
+    return load_table("chip_usage")
+
+
+def load_jager_cup_matches():
+    return load_table("jager_cup_matches")
+
+
+def load_live_scores(data_dir=DATA_DIR):
+    """Live scores of the current gameweek, or an empty DataFrame if there are none."""
+    try:
+        return load_table("live_scores", data_dir)
+    except FileNotFoundError:
+        return pd.DataFrame()
+
+
+def load_alltime_table(name, data_dir=DATA_DIR):
+    """alltime_seasons or alltime_managers (see archive.py), or an empty DataFrame."""
+    try:
+        return load_table(name, data_dir)
+    except FileNotFoundError:
+        return pd.DataFrame()
+
+
+def load_season(data_dir=DATA_DIR):
+    """Label of the season in the data, such as "2025-26", or None if unknown."""
+    try:
+        gw_info = load_table("gameweek_info", data_dir)
+    except FileNotFoundError:
+        return None
+    if gw_info.empty or "season" not in gw_info.columns or pd.isna(gw_info["season"].iloc[0]):
+        return None
+    return gw_info["season"].iloc[0]
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_finished_gameweeks(data_dir, version):
+    gw_info = read_table("gameweek_info", data_dir)
+    if gw_info.empty or "finished_events" not in gw_info.columns:
+        return None
+    return parse_finished_events(gw_info["finished_events"].iloc[0])
+
+
+def finished_gameweeks_in(directory):
+    version = table_version("gameweek_info", directory)
+    if version is None:
+        return None
+    return _load_finished_gameweeks(directory, version)
+
+
+def load_finished_gameweeks(data_dir=DATA_DIR):
+    """Return the finished gameweeks, or None if the gameweek info is missing."""
+    return finished_gameweeks_in(source_dir(data_dir))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_league_tables(directory, versions):
+    def read_optional(name):
+        try:
+            return read_table(name, directory)
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+    return build_league_tables(
+        read_table("weekly_scores", directory),
+        read_optional("chip_usage"),
+        read_optional("jager_cup_matches"),
+        finished_gameweeks_in(directory),
+    )
+
+
+def league_table_version(name, data_dir=DATA_DIR):
+    """Version of a derived table, or of the raw tables it would be built from."""
+    version = table_version(name, data_dir)
+    if version is not None:
+        return version
+    return tuple(
+        table_version(raw, data_dir)
+        for raw in ("weekly_scores", "chip_usage", "jager_cup_matches", "gameweek_info")
+    )
+
+
+def league_table_in(name, directory):
+    version = league_table_version(name, directory)
+    if not isinstance(version, tuple):
+        return table_in(name, directory)
+    if table_version("weekly_scores", directory) is None:
+        return pd.DataFrame()
+    return _build_league_tables(directory, version).get(name, pd.DataFrame())
+
+
+def load_league_table(name, data_dir=DATA_DIR):
+    """Load a table precomputed by initial_setup.py.
+
+    Falls back to deriving it from the raw tables when the ingest hasn't written
+    it; returns an empty DataFrame when there is nothing to derive it from.
+    """
+    return league_table_in(name, source_dir(data_dir))
+
+
+def league_db_version(directory):
+    """(path, version) of a directory's league database, with a None version if there isn't one.
+
+    league.db isn't committed with the tables, so one missing or older than the
+    weekly scores (e.g. after a git pull) is rebuilt from them first. Where that
+    fails, e.g. in a read-only directory, the pages fall back to pandas.
+    """
+    path = league_db.db_path(directory)
+    scores = table_path("weekly_scores", directory)
+    with _league_db_lock:
+        try:
+            stale = os.path.getmtime(scores) > (
+                os.path.getmtime(path) if os.path.exists(path) else float("-inf")
+            )
+        except OSError:
+            stale = False  # No Parquet weekly scores to build it from
+        if stale:
+            try:
+                league_db.build_database(
+                    league_db.weekly_score_batches(directory), finished_gameweeks_in(directory), directory
+                )
+                print(f"Rebuilt the league database in {directory}")
+            except (OSError, sqlite3.Error) as e:
+                print(f"Couldn't rebuild the league database in {directory}: {e}")
+                return path, None
+    return path, file_version(path)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _query_manager_names(path, version):
+    with closing(league_db.connect(path)) as conn:
+        return league_db.manager_names(conn)
+
+
+def load_manager_names(data_dir=DATA_DIR):
+    """Sorted names of the managers in the league."""
+    directory = source_dir(data_dir)
+    path, version = league_db_version(directory)
+    if version is not None:
+        return _query_manager_names(path, version)
+    return sorted(set(table_in("weekly_scores", directory)["player_name"]))
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _query_top_finishes(path, version, player_name, top_n):
+    with closing(league_db.connect(path)) as conn:
+        return league_db.top_finishes(conn, player_name, top_n)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _load_top_finishes(directory, version, player_name, top_n):
+    df_event_ranks = league_table_in("event_ranks", directory)
+    if df_event_ranks.empty:
+        return df_event_ranks, df_event_ranks
+    return top_finishes(df_event_ranks, player_name, top_n)
+
+
+def load_top_finishes(player_name, top_n=5, data_dir=DATA_DIR):
+    """Top-N finishes of a manager, cached by data version and manager.
+
+    Queried from the league database when there is one, so only that manager's
+    rows are read; otherwise filtered from the event ranks table.
+    """
+    directory = source_dir(data_dir)
+    path, version = league_db_version(directory)
+    if version is not None:
+        return _query_top_finishes(path, version, player_name, top_n)
+    version = league_table_version("event_ranks", directory)
+    return _load_top_finishes(directory, version, player_name, top_n)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_cup_view_model(directory, version):
+    return cup_view_model(league_table_in("cup_matches", directory))
+
+
+def load_cup_view_model(data_dir=DATA_DIR):
+    """Cup page records per stage (see league_analytics.cup_view_model), cached by data version."""
+    directory = source_dir(data_dir)
+    version = league_table_version("cup_matches", directory)
+    return _load_cup_view_model(directory, version)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_prize_fund(path, version):
+    return pd.read_csv(path)
+
+
+def load_prize_fund(path=PRIZE_FUND_PATH):
+    return _load_prize_fund(path, file_version(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_run_report(path, version):
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_run_report(data_dir=DATA_DIR):
+    """Return the run report of the last ingest, by hand or by the background
+    refresh, or None if there isn't one."""
+    paths = [
+        os.path.join(directory, RUN_REPORT_NAME)
+        for directory in (data_dir, refresh_dir(data_dir))
+        if os.path.exists(os.path.join(directory, RUN_REPORT_NAME))
+    ]
+    if not paths:
+        return None
+    path = max(paths, key=os.path.getmtime)
+    return _load_run_report(path, file_version(path))
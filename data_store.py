@@ -0,0 +1,446 @@
+"""Typed Parquet storage for the league tables, with CSV export for compatibility."""
+
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+DATA_DIR = os.environ.get("FPL_DATA_DIR", "data")  # Overridable, e.g. for benchmarks
+WRITE_CSV = True  # Keep writing the CSV copies alongside the Parquet files
+READ_BATCH_SIZE = 64 * 1024  # Rows per record batch when streaming a table
+SNAPSHOTS_DIR = "snapshots"  # Published versions of a data directory, under it
+CURRENT_NAME = "CURRENT"  # File naming the snapshot readers should use
+INGEST_MARKER = "INGESTING"  # Present in a data directory while an ingest writes its tables
+KEEP_SNAPSHOTS = 3  # Older snapshots are deleted once a new one is published
+SNAPSHOT_EXTENSIONS = (".parquet", ".csv", ".db")
+REFRESH_DIR = ".refresh"  # Untracked copy of the data the app's background refresh writes to
+
+NAME = pa.dictionary(pa.int32(), pa.string())
+
+# Explicit column types per table; columns not listed keep their inferred type
+SCHEMAS = {
+    "weekly_scores": pa.schema(
+        [
+            ("event", pa.int8()),
+            ("points", pa.int16()),
+            ("total_points", pa.int16()),
+            ("rank", pa.int32()),
+            ("rank_sort", pa.int32()),
+            ("overall_rank", pa.int32()),
+            ("percentile_rank", pa.int16()),
+            ("overall_rank_percentage", pa.int16()),
+            ("bank", pa.int16()),
+            ("value", pa.int16()),
+            ("event_transfers", pa.int8()),
+            ("event_transfers_cost", pa.int16()),
+            ("points_on_bench", pa.int16()),
+            ("player_name", NAME),
+            ("team_name", NAME),
+            ("entry_id", pa.int32()),
+        ]
+    ),
+    "chip_usage": pa.schema(
+        [
+            ("entry_id", pa.int32()),
+            ("player_name", NAME),
+            ("team_name", NAME),
+            ("event", pa.int8()),
+            ("chip", NAME),
+        ]
+    ),
+    "jager_cup_matches": pa.schema(
+        [
+            ("event", pa.int8()),
+            ("stage", NAME),
+            ("entry_1_id", pa.int32()),
+            ("entry_1_player_name", NAME),
+            ("entry_1_team_name", NAME),
+            ("entry_1_points", pa.int16()),
+            ("entry_2_id", pa.int32()),
+            ("entry_2_player_name", NAME),
+            ("entry_2_team_name", NAME),
+            ("entry_2_points", pa.int16()),
+            ("winner", pa.int32()),
+            ("is_bye", pa.bool_()),
+        ]
+    ),
+    "live_picks": pa.schema(
+        [
+            ("entry_id", pa.int32()),
+            ("event", pa.int8()),
+            ("position", pa.int8()),
+            ("element", pa.int16()),
+            ("multiplier", pa.int8()),
+            ("is_captain", pa.bool_()),
+            ("active_chip", NAME),
+            ("event_transfers_cost", pa.int16()),
+        ]
+    ),
+    "live_scores": pa.schema(
+        [
+            ("entry_id", pa.int32()),
+            ("player_name", NAME),
+            ("team_name", NAME),
+            ("event", pa.int8()),
+            ("points", pa.int16()),
+            ("points_on_bench", pa.int16()),
+            ("event_transfers_cost", pa.int16()),
+            ("net_points", pa.int16()),
+            ("active_chip", NAME),
+            ("rank", pa.int32()),
+        ]
+    ),
+    "gameweek_info": pa.schema(
+        [
+            ("current_event", pa.int8()),
+            ("finished_events", pa.string()),
+            ("season", pa.string()),
+        ]
+    ),
+}
+
+
+def parse_finished_events(value):
+    """Parse the comma separated finished_events value into a list of gameweeks."""
+    if value is None or pd.isna(value):
+        return []
+    return [int(x) for x in str(value).split(",") if x.strip()]
+
+
+def table_path(name, data_dir=DATA_DIR, ext="parquet"):
+    return os.path.join(data_dir, f"{name}.{ext}")
+
+
+def to_arrow(df, name):
+    """Convert a DataFrame to an Arrow table using the table's schema where known."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = SCHEMAS.get(name, pa.schema([]))
+    fields = [
+        schema.field(field.name) if field.name in schema.names else field
+        for field in table.schema
+    ]
+    return table.cast(pa.schema(fields))
+
+
+def write_table(df, name, data_dir=DATA_DIR, csv=WRITE_CSV):
+    """Write a table to Parquet (and CSV, for compatibility)."""
+    os.makedirs(data_dir, exist_ok=True)
+    # Written aside and renamed, so a page reading the table never sees half a file
+    path = table_path(name, data_dir)
+    pq.write_table(to_arrow(df, name), f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    if csv:
+        csv_path = table_path(name, data_dir, "csv")
+        df.to_csv(f"{csv_path}.tmp", index=False)
+        os.replace(f"{csv_path}.tmp", csv_path)
+
+
+def remove_table(name, data_dir=DATA_DIR):
+    """Delete a table's Parquet and CSV files, if there are any."""
+    for ext in ("parquet", "csv"):
+        try:
+            os.remove(table_path(name, data_dir, ext))
+        except FileNotFoundError:
+            pass
+
+
+def to_pandas(table):
+    """Convert an Arrow table to pandas with alphabetically ordered categories.
+
+    Sorted categories keep groupby/sort output in the same order as plain strings.
+    """
+    df = table.to_pandas()
+    for column in df.select_dtypes("category").columns:
+        categories = df[column].cat.categories
+        df[column] = df[column].cat.reorder_categories(sorted(categories))
+    return df
+
+
+def read_table(name, data_dir=DATA_DIR, columns=None):
+    """Read a table, preferring Parquet and falling back to the CSV copy.
+
+    Raises FileNotFoundError when neither file exists.
+    """
+    path = table_path(name, data_dir)
+    if os.path.exists(path):
+        return to_pandas(pq.read_table(path, columns=columns, memory_map=True))
+
+    csv_path = table_path(name, data_dir, "csv")
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"No data found for table '{name}' in {data_dir}")
+    df = pd.read_csv(csv_path, usecols=columns, dtype={"finished_events": str})
+    return to_pandas(to_arrow(df, name))
+
+
+def iter_table_batches(name, data_dir=DATA_DIR, batch_size=READ_BATCH_SIZE, columns=None):
+    """Yield a table as Arrow record batches without loading it whole."""
+    path = table_path(name, data_dir)
+    if os.path.exists(path):
+        yield from pq.ParquetFile(path, memory_map=True).iter_batches(batch_size, columns=columns)
+        return
+
+    csv_path = table_path(name, data_dir, "csv")
+    if not os.path.exists(csv_path):
+        return
+    for chunk in pd.read_csv(
+        csv_path, chunksize=batch_size, usecols=columns, dtype={"finished_events": str}
+    ):
+        yield from to_arrow(chunk, name).to_batches()
+
+
+def parts_dir(name, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"{name}.parts")
+
+
+def part_paths(name, data_dir=DATA_DIR):
+    """Paths of the parts written so far for a streamed table, in write order."""
+    directory = parts_dir(name, data_dir)
+    if not os.path.isdir(directory):
+        return []
+    return [
+        os.path.join(directory, file)
+        for file in sorted(os.listdir(directory))
+        if file.endswith(".parquet")
+    ]
+
+
+def part_number(path):
+    return int(os.path.basename(path)[len("part-") : -len(".parquet")])
+
+
+def prune_parts(name, keep, data_dir=DATA_DIR):
+    """Delete the parts of a streamed table whose numbers are not in keep."""
+    for path in part_paths(name, data_dir):
+        if part_number(path) not in keep:
+            os.remove(path)
+
+
+def write_part(df, name, part, data_dir=DATA_DIR):
+    """Write one batch of a streamed table as its own Parquet part file."""
+    directory = parts_dir(name, data_dir)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"part-{part:05d}.parquet")
+    pq.write_table(to_arrow(df, name), f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+
+def clear_parts(name, data_dir=DATA_DIR):
+    shutil.rmtree(parts_dir(name, data_dir), ignore_errors=True)
+
+
+def conform(table, schema):
+    """Cast a table to schema, adding any missing columns as nulls."""
+    columns = [
+        table[field.name].cast(field.type)
+        if field.name in table.column_names
+        else pa.nulls(len(table), field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def compact_parts(
+    name, data_dir=DATA_DIR, keep_events=None, keep_entries=None, csv=WRITE_CSV
+):
+    """Combine a streamed table's parts into its Parquet (and CSV) file.
+
+    With keep_events, the rows of the current table for those gameweeks (and,
+    with keep_entries, those entry ids) are written first, so an incremental
+    refresh keeps them. Parts are copied one at a time and then removed.
+
+    Does nothing and returns False when there are no parts, so a rerun after a
+    crash between removing the parts and recording the compaction keeps the
+    table it already wrote.
+    """
+    paths = part_paths(name, data_dir)
+    if not paths:
+        return False
+    kept = iter(())
+    if keep_events is not None:
+        kept = iter_table_batches(name, data_dir)
+    first_kept = next(kept, None)
+
+    # Batches can infer different types for untyped columns, so unify them
+    schemas = [pq.read_schema(path).remove_metadata() for path in paths]
+    if first_kept is not None:
+        schemas.insert(0, first_kept.schema.remove_metadata())
+    if not schemas:
+        return False
+    schema = pa.unify_schemas(schemas, promote_options="permissive")
+
+    def tables():
+        if first_kept is not None:
+            event_type = first_kept.schema.field("event").type
+            keep = pa.array(sorted(keep_events), type=event_type)
+            if keep_entries is not None:
+                entry_type = first_kept.schema.field("entry_id").type
+                entries = pa.array(sorted(keep_entries), type=entry_type)
+            for batch in (first_kept, *kept):
+                mask = pc.is_in(batch["event"], value_set=keep)
+                if keep_entries is not None:
+                    mask = pc.and_(mask, pc.is_in(batch["entry_id"], value_set=entries))
+                yield pa.Table.from_batches([batch.filter(mask)])
+        for path in paths:
+            yield pq.read_table(path)
+
+    path = table_path(name, data_dir)
+    csv_path = table_path(name, data_dir, "csv")
+    with pq.ParquetWriter(f"{path}.tmp", schema) as writer:
+        header = True
+        for table in tables():
+            table = conform(table, schema)
+            writer.write_table(table)
+            if csv:
+                table.to_pandas().to_csv(
+                    f"{csv_path}.tmp", mode="w" if header else "a", header=header, index=False
+                )
+                header = False
+
+    # Only replace the current files once the new ones are complete
+    os.replace(f"{path}.tmp", path)
+    if csv:
+        os.replace(f"{csv_path}.tmp", csv_path)
+    clear_parts(name, data_dir)
+    return True
+
+
+def replace_files(files, source_dir, target_dir):
+    """Copy files from source_dir over those in target_dir, each replaced atomically.
+
+    Existing files are renamed over rather than written to, so snapshots
+    hard-linked to them keep their contents.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    for file in files:
+        target = os.path.join(target_dir, file)
+        shutil.copy2(os.path.join(source_dir, file), f"{target}.tmp")
+        os.replace(f"{target}.tmp", target)
+
+
+def link_files(files, source_dir, target_dir):
+    """Hard-link files from source_dir into target_dir, copying where links fail."""
+    os.makedirs(target_dir, exist_ok=True)
+    for file in files:
+        source = os.path.join(source_dir, file)
+        try:
+            os.link(source, os.path.join(target_dir, file))
+        except OSError:
+            shutil.copy2(source, os.path.join(target_dir, file))
+
+
+def table_files(data_dir=DATA_DIR):
+    """Names of the table files directly in data_dir, i.e. what a snapshot holds."""
+    return [
+        file
+        for file in sorted(os.listdir(data_dir))
+        if file.endswith(SNAPSHOT_EXTENSIONS) and os.path.isfile(os.path.join(data_dir, file))
+    ]
+
+
+def data_time(data_dir=DATA_DIR):
+    """When a table file directly in data_dir was last written, or None if there are none.
+
+    Database files don't count: league.db is rebuilt from the tables whenever
+    it is missing (see league_db.py), which doesn't make the data any newer.
+    """
+    try:
+        files = [file for file in table_files(data_dir) if not file.endswith(".db")]
+        return max((os.path.getmtime(os.path.join(data_dir, file)) for file in files), default=None)
+    except OSError:
+        return None
+
+
+def refresh_dir(data_dir=DATA_DIR):
+    return os.path.join(data_dir, REFRESH_DIR)
+
+
+def snapshot_path(version, data_dir=DATA_DIR):
+    return os.path.join(data_dir, SNAPSHOTS_DIR, version)
+
+
+def current_version(data_dir=DATA_DIR):
+    """The version named by data_dir/CURRENT, or None before the first snapshot."""
+    try:
+        with open(os.path.join(data_dir, CURRENT_NAME)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def publish_snapshot(data_dir=DATA_DIR, keep=KEEP_SNAPSHOTS):
+    """Freeze the tables in data_dir into a new snapshot and make it current.
+
+    The table files are hard-linked (copied where the filesystem can't link);
+    tables are always replaced by renaming a new file over them, so a published
+    snapshot never changes. CURRENT is switched with an atomic rename, so
+    readers see either the previous snapshot or the new one, never a mix.
+    Returns the new version.
+    """
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    path = snapshot_path(version, data_dir)
+    link_files(table_files(data_dir), data_dir, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+    current_path = os.path.join(data_dir, CURRENT_NAME)
+    with open(f"{current_path}.tmp", "w") as f:
+        f.write(version)
+    os.replace(f"{current_path}.tmp", current_path)
+
+    # Versions sort by time; keep a few so in-flight readers can finish
+    versions = sorted(os.listdir(os.path.join(data_dir, SNAPSHOTS_DIR)))
+    for old in versions[:-keep]:
+        shutil.rmtree(snapshot_path(old, data_dir), ignore_errors=True)
+    return version
+
+
+def begin_ingest(data_dir=DATA_DIR):
+    """Hide the tables in data_dir from readers while an ingest rewrites them.
+
+    Until end_ingest, latest_data_dir only offers data_dir's snapshots. A
+    failed ingest leaves the marker behind, so its half-written tables stay
+    hidden until the next complete one.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    with open(os.path.join(data_dir, INGEST_MARKER), "w") as f:
+        f.write(str(os.getpid()))
+
+
+def end_ingest(data_dir=DATA_DIR):
+    """Mark the tables in data_dir as complete again, before publishing them."""
+    try:
+        os.remove(os.path.join(data_dir, INGEST_MARKER))
+    except FileNotFoundError:
+        pass
+
+
+def ingest_in_progress(data_dir=DATA_DIR):
+    return os.path.exists(os.path.join(data_dir, INGEST_MARKER))
+
+
+def latest_data_dir(data_dir=DATA_DIR):
+    """Directory holding the newest complete copy of data_dir's tables.
+
+    That is the current snapshot of data_dir or of its refresh directory (see
+    refresh_worker.py), whichever was published last, unless the tables in
+    data_dir itself were written since, e.g. by a git pull of the scheduled
+    workflow's data. Tables an ingest is still writing never count (see
+    begin_ingest). Ties go to the snapshot. Falls back to data_dir.
+    """
+    candidates = []
+    written_at = data_time(data_dir)
+    if written_at is not None and not ingest_in_progress(data_dir):
+        candidates.append((written_at, False, data_dir))
+    for root in (data_dir, refresh_dir(data_dir)):
+        version = current_version(root)
+        if version is None or not os.path.isdir(snapshot_path(version, root)):
+            continue
+        try:
+            published_at = os.path.getmtime(os.path.join(root, CURRENT_NAME))
+        except OSError:
+            continue
+        candidates.append((published_at, True, snapshot_path(version, root)))
+    return max(candidates)[2] if candidates else data_dir
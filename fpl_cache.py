@@ -0,0 +1,195 @@
+"""On-disk cache for FPL API responses, keyed by URL."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+
+CACHE_DIR = "data/.http_cache"
+MAX_CACHE_BYTES = 200 * 1024 * 1024  # Evict least recently used responses above this
+OFFLINE = os.environ.get("FPL_OFFLINE") == "1"  # Serve only from cache, never hit the API
+DEFAULT_TTL = 10 * 60
+# The background refresh (refresh_worker.py) is timed from these, so its live
+# refreshes always get fresh live points and its full ones fresh standings
+LIVE_TTL = 60  # Live points of the gameweek in progress
+CURRENT_EVENT_TTL = 60 * 60  # Standings, cup matches and histories, which change with it
+
+# Time to live in seconds for each endpoint, first match wins (None = never expires)
+TTL_RULES = [
+    (r"/bootstrap-static/", 5 * 60),
+    (r"/leagues-classic/\d+/standings/", CURRENT_EVENT_TTL),
+    (r"/leagues-h2h-matches/league/\d+/", CURRENT_EVENT_TTL),
+    (r"/entry/\d+/history/", CURRENT_EVENT_TTL),
+    (r"/entry/\d+/event/\d+/picks/", 5 * 60),
+    (r"/event/\d+/live/", LIVE_TTL),
+]
+
+# Endpoints whose content is frozen once the gameweek in the URL has finished
+FINISHED_EVENT_PATTERNS = [
+    r"/entry/\d+/event/(\d+)/picks/",
+    r"/event/(\d+)/live/",
+    r"[?&]event=(\d+)",
+]
+
+_finished_events = set()
+_cache_size = None
+_lock = threading.Lock()
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response when serving from the cache."""
+
+    def __init__(self, url, status_code, content=b"", headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for url: {self.url}", response=self)
+
+
+def set_finished_events(events):
+    """Record finished gameweeks so their responses are cached forever."""
+    _finished_events.clear()
+    _finished_events.update(int(event) for event in events)
+
+
+def get_ttl(url):
+    for pattern in FINISHED_EVENT_PATTERNS:
+        match = re.search(pattern, url)
+        if match and int(match.group(1)) in _finished_events:
+            return None
+    for pattern, ttl in TTL_RULES:
+        if re.search(pattern, url):
+            return ttl
+    return DEFAULT_TTL
+
+
+def _paths(url):
+    key = hashlib.sha1(url.encode()).hexdigest()
+    base = os.path.join(CACHE_DIR, key[:2], key)
+    return f"{base}.json", f"{base}.body"
+
+
+def _read_entry(url):
+    meta_path, body_path = _paths(url)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    return meta, body
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _store(url, response):
+    global _cache_size
+    meta_path, body_path = _paths(url)
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    meta = {
+        "url": url,
+        "fetched_at": time.time(),
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    _write_atomic(body_path, response.content)
+    _write_atomic(meta_path, json.dumps(meta).encode())
+
+    with _lock:
+        if _cache_size is None:
+            _cache_size = _disk_usage()
+        else:
+            _cache_size += len(response.content)
+        if _cache_size > MAX_CACHE_BYTES:
+            _evict()
+
+
+def _touch(path):
+    """Mark a response as recently used for eviction, unless it was just evicted."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _refresh(url, meta):
+    meta_path, body_path = _paths(url)
+    meta["fetched_at"] = time.time()
+    _write_atomic(meta_path, json.dumps(meta).encode())
+    _touch(body_path)
+
+
+def _body_files():
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            if name.endswith(".body"):
+                yield os.path.join(root, name)
+
+
+def _disk_usage():
+    return sum(os.path.getsize(path) for path in _body_files())
+
+
+def _evict():
+    """Delete least recently used responses until the cache fits in MAX_CACHE_BYTES."""
+    global _cache_size
+    bodies = sorted(_body_files(), key=os.path.getmtime)
+    _cache_size = sum(os.path.getsize(path) for path in bodies)
+    target = MAX_CACHE_BYTES * 0.9
+    for body_path in bodies:
+        if _cache_size <= target:
+            break
+        size = os.path.getsize(body_path)
+        for path in (body_path, body_path[: -len(".body")] + ".json"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        _cache_size -= size
+
+
+def cached_get(url, fetch=requests.get):
+    """GET an FPL API url through the on-disk cache.
+
+    Fresh entries are served without a request, stale ones are revalidated with
+    If-None-Match/If-Modified-Since, and in OFFLINE mode a cache miss returns 504.
+    """
+    meta, body = _read_entry(url)
+    if meta is not None:
+        ttl = get_ttl(url)
+        if OFFLINE or ttl is None or time.time() - meta["fetched_at"] < ttl:
+            _touch(_paths(url)[1])
+            return CachedResponse(url, 200, body, {"X-Cache": "HIT"})
+    elif OFFLINE:
+        return CachedResponse(url, 504, b"", {"X-Cache": "MISS"})
+
+    headers = {}
+    if meta is not None and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta is not None and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = fetch(url, headers=headers)
+    if response.status_code == 304 and meta is not None:
+        _refresh(url, meta)
+        return CachedResponse(url, 200, body, {"X-Cache": "REVALIDATED"})
+    if response.status_code == 200:
+        _store(url, response)
+    return response
@@ -0,0 +1,122 @@
+"""Shared HTTP client for the FPL API with pooling, retries and rate limiting."""
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fpl_cache import CachedResponse, cached_get
+from instrumentation import record_request
+
+TIMEOUT = (5, 30)  # Connect and read timeouts in seconds
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5  # Seconds before the first retry, doubled on every attempt
+BACKOFF_CAP = 30
+MAX_RETRY_AFTER = 120  # Longest Retry-After honoured, in seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REQUESTS_PER_SECOND = 10
+BURST = 20
+POOL_SIZE = 16
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second on average."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class FPLClient:
+    """Pooled session that retries transient failures and respects rate limits."""
+
+    def __init__(
+        self,
+        pool_size=POOL_SIZE,
+        timeout=TIMEOUT,
+        max_retries=MAX_RETRIES,
+        requests_per_second=REQUESTS_PER_SECOND,
+        burst=BURST,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = TokenBucket(requests_per_second, burst)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "fpl-jager-crew"
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt, response=None):
+        # Honour the server's Retry-After on rate limiting (up to a limit, so a
+        # bogus value can't stall a worker), otherwise full jitter
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+    def fetch(self, url, headers=None):
+        """GET a url from the network, retrying 429/5xx responses and connection errors."""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                print(f"Request to {url} failed ({e}), retrying")
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            print(f"Request to {url} returned {response.status_code}, retrying")
+            time.sleep(self._backoff(attempt, response))
+
+    def get(self, url):
+        """GET an FPL API url through the response cache, recording its metrics."""
+        start = time.perf_counter()
+        response = cached_get(url, fetch=self.fetch)
+        cache_status = (
+            response.headers["X-Cache"] if isinstance(response, CachedResponse) else "MISS"
+        )
+        record_request(
+            url,
+            time.perf_counter() - start,
+            response.status_code,
+            len(response.content),
+            cache_status,
+        )
+        return response
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide FPL client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = FPLClient()
+        return _client
@@ -1,9 +1,48 @@
-import requests
+import argparse
+import json
+import os
 import pandas as pd
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from archive import archive_season, save_alltime_tables
+from checkpoint import CrawlJournal
+from data_store import (
+    DATA_DIR,
+    begin_ingest,
+    compact_parts,
+    end_ingest,
+    parse_finished_events,
+    prune_parts,
+    publish_snapshot,
+    read_table,
+    remove_table,
+    write_part,
+    write_table,
+)
+from fpl_cache import set_finished_events
+from fpl_client import get_client
+from instrumentation import reset, timed, write_run_report
+import league_db
+from league_analytics import (
+    CHIP_PERIODS,
+    LEAGUE_TABLES,
+    build_league_tables,
+    cup_display_table,
+    score_tables,
+    validate_chip_periods,
+)
+from live_scoring import live_element_points, live_leaderboard, live_scores, picks_table
 
 BASE_URL = "https://fantasy.premierleague.com/api"
 LEAGUE_ID = 43344  # Replace with actual league ID
 JAGER_CUP_LEAGUE_ID = 3023235  # Jager Cup H2H league ID
+MAX_WORKERS = 8  # Maximum number of concurrent FPL API requests
+USE_PICKS_FOR_CHIPS = False  # Probe every gameweek's picks instead of reading chips from history
+INCREMENTAL = True  # Only refresh unfinished gameweeks and new entries when data already exists
+STREAM_BATCH_SIZE = 500  # Managers fetched and written per batch in streaming mode
+LIVE_SCORES = True  # Score the current gameweek from live player points while it is in progress
+ALL_GAMEWEEKS = range(1, 39)
 # use the following league to get code in 32/33 https://fantasy.premierleague.com/api/leagues-classic/43344/standings/
 
 
@@ -11,7 +50,7 @@ JAGER_CUP_LEAGUE_ID = 3023235  # Jager Cup H2H league ID
 def get_current_gameweek_info():
     """Get current gameweek information from FPL API."""
     url = f"{BASE_URL}/bootstrap-static/"
-    response = requests.get(url)
+    response = get_client().get(url)
     
     if response.status_code != 200:
         print(f"Failed to fetch gameweek info. Status code: {response.status_code}")
@@ -29,86 +68,229 @@ def get_current_gameweek_info():
             current_event = event["id"]
         if event["finished"]:
             finished_events.append(event["id"])
+
+    # Responses for finished gameweeks never change, so they can be cached forever
+    set_finished_events(finished_events)
     
     return {
         "current_event": current_event,
         "finished_events": finished_events,
-        "all_events": events
+        "all_events": events,
+        "season": get_season(events),
     }
 
 
-# Function to get list of managers in the league
-def get_league_entries(league_id):
-    entries = []
+# Function to label the season, e.g. "2025-26", from the first gameweek's deadline
+def get_season(events):
+    if not events or not events[0].get("deadline_time"):
+        return None
+    start_year = int(events[0]["deadline_time"][:4])
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+# Function to yield the managers in the league, one standings page at a time
+def iter_league_entries(league_id):
     page = 1
     while True:
         url = f"{BASE_URL}/leagues-classic/{league_id}/standings/?page_new_entries=1&page_standings={page}"
-        r = requests.get(url)
+        r = get_client().get(url)
+        r.raise_for_status()
         data = r.json()
         standings = data["standings"]["results"]
         if not standings:
             break
-        entries.extend(standings)
+        yield from standings
         page += 1
-    return entries
 
 
-# Function to get chip usage for a manager across all gameweeks
-def get_manager_chips(entry_id):
+# Function to get list of managers in the league
+def get_league_entries(league_id):
+    return list(iter_league_entries(league_id))
+
+
+# Function to split an iterable into lists of at most size items
+def iter_chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Function to get a manager's picks for a single gameweek
+def get_gameweek_picks(entry_id, gw):
+    url = f"{BASE_URL}/entry/{entry_id}/event/{gw}/picks/"
+    r = get_client().get(url)
+    if r.status_code == 404:
+        # The gameweek might not be available yet
+        return None
+    r.raise_for_status()
+    return r.json()
+
+
+# Function to turn a manager's picks (in gameweek order) into chip usage
+def collect_chips(picks_by_gw):
     chips_used = []
-    # Try to get picks for each gameweek (1-38)
-    for gw in range(1, 39):
-        url = f"{BASE_URL}/entry/{entry_id}/event/{gw}/picks/"
-        r = requests.get(url)
-        if r.status_code == 200:
-            data = r.json()
-            if data.get("active_chip"):
-                chips_used.append({"event": gw, "chip": data["active_chip"]})
-        else:
-            # If we get an error, the gameweek might not be available yet
+    for gw, data in picks_by_gw:
+        if data is None:
+            # Later gameweeks are not available either
             break
+        if data.get("active_chip"):
+            chips_used.append({"event": gw, "chip": data["active_chip"]})
     return chips_used
 
 
+# Function to get chip usage for a manager by probing every gameweek's picks
+def get_manager_chips(entry_id, gameweeks=ALL_GAMEWEEKS):
+    # Try to get picks for each gameweek, stopping at the first unavailable one
+    return collect_chips((gw, get_gameweek_picks(entry_id, gw)) for gw in gameweeks)
+
+
+# Function to get the full history payload for a given manager/team ID
+def get_team_history(entry_id):
+    url = f"{BASE_URL}/entry/{entry_id}/history/"
+    r = get_client().get(url)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    return r.json()
+
+
 # Function to get weekly history for a given manager/team ID
 def get_team_weekly_data(entry_id):
-    url = f"{BASE_URL}/entry/{entry_id}/history/"
-    r = requests.get(url)
-    if r.status_code != 200:
+    data = get_team_history(entry_id)
+    if data is None:
         return None
-    data = r.json()
     return data.get("current", [])  # Weekly data
 
 
-# Main function to gather all weekly data
-def get_league_data(league_id):
-    league_entries = get_league_entries(league_id)
+# Function to read chip usage from an already fetched history payload
+def get_chips_from_history(history, gameweeks=ALL_GAMEWEEKS):
+    if not history:
+        return []
+    return [
+        {"event": chip["event"], "chip": chip["name"]}
+        for chip in sorted(history.get("chips", []), key=lambda chip: chip["event"])
+        if chip["event"] in gameweeks
+    ]
+
+
+# Function to fetch history (and optionally picks) for many managers at once
+def fetch_entries_concurrently(gameweeks_by_entry, max_workers, use_picks_for_chips=False):
+    """Fan out history and per-gameweek picks requests over a thread pool."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        history_futures = {
+            entry_id: executor.submit(get_team_history, entry_id)
+            for entry_id in gameweeks_by_entry
+        }
+        picks_futures = {
+            entry_id: [
+                (gw, executor.submit(get_gameweek_picks, entry_id, gw))
+                for gw in (gameweeks if use_picks_for_chips else [])
+            ]
+            for entry_id, gameweeks in gameweeks_by_entry.items()
+        }
+
+        # Collect results in league order so the output stays deterministic
+        history_by_entry = {
+            entry_id: future.result() for entry_id, future in history_futures.items()
+        }
+        if use_picks_for_chips:
+            chips_by_entry = {
+                entry_id: collect_chips((gw, future.result()) for gw, future in futures)
+                for entry_id, futures in picks_futures.items()
+            }
+        else:
+            chips_by_entry = {
+                entry_id: get_chips_from_history(
+                    history_by_entry[entry_id], gameweeks
+                )
+                for entry_id, gameweeks in gameweeks_by_entry.items()
+            }
+
+    return history_by_entry, chips_by_entry
+
+
+# Function to fetch history and chips for a set of entries
+def fetch_entry_data(gameweeks_by_entry, max_workers=1, use_picks_for_chips=False):
+    """Return (history_by_entry, chips_by_entry) for the requested gameweeks."""
+    if max_workers > 1:
+        return fetch_entries_concurrently(
+            gameweeks_by_entry, max_workers, use_picks_for_chips
+        )
+
+    history_by_entry = {
+        entry_id: get_team_history(entry_id) for entry_id in gameweeks_by_entry
+    }
+    # Chips come from the history payload unless the picks probe is requested
+    if use_picks_for_chips:
+        chips_by_entry = {
+            entry_id: get_manager_chips(entry_id, gameweeks)
+            for entry_id, gameweeks in gameweeks_by_entry.items()
+        }
+    else:
+        chips_by_entry = {
+            entry_id: get_chips_from_history(history_by_entry[entry_id], gameweeks)
+            for entry_id, gameweeks in gameweeks_by_entry.items()
+        }
+    return history_by_entry, chips_by_entry
+
+
+# Function to work out which gameweeks need fetching for each league entry
+def get_gameweeks_by_entry(
+    league_entries, finished_events=(), known_entries=(), current_event=None
+):
+    # Gameweeks after the current one haven't started, so there is nothing to fetch
+    gameweeks = [
+        gw for gw in ALL_GAMEWEEKS if current_event is None or gw <= current_event
+    ]
+    # Known entries only need the gameweeks that were not finished last time
+    stale_gameweeks = [gw for gw in gameweeks if gw not in set(finished_events)]
+    return {
+        entry["entry"]: (
+            stale_gameweeks if entry["entry"] in known_entries else gameweeks
+        )
+        for entry in league_entries
+    }
+
+
+# Function to turn fetched histories and chips into the league's two tables
+def build_league_data(league_entries, gameweeks_by_entry, history_by_entry, chips_by_entry):
     all_data = []
     chip_data = []
 
-    # Debug: Print the first entry to see available fields
-    if league_entries:
-        print("Available fields in league entry:", list(league_entries[0].keys()))
-
     for entry in league_entries:
         entry_id = entry["entry"]  # FPL team ID
         # Handle potential missing player_name field
         player_name = entry.get("player_name", "Unknown Player")
         team_name = entry.get("entry_name", "Unknown Team")
+        gameweeks = gameweeks_by_entry[entry_id]
 
         # Get weekly scores data
-        weekly_data = get_team_weekly_data(entry_id)
-        
+        history = history_by_entry[entry_id]
+        weekly_data = history.get("current", []) if history else None
+
         if weekly_data:
             for gw in weekly_data:
-                gw["player_name"] = player_name
-                gw["team_name"] = team_name
-                gw["entry_id"] = entry_id
-                all_data.append(gw)
+                if gw["event"] not in gameweeks:
+                    continue
+                all_data.append(
+                    dict(
+                        gw,
+                        player_name=player_name,
+                        team_name=team_name,
+                        entry_id=entry_id,
+                    )
+                )
 
         # Get chip usage data separately
-        chips_used = get_manager_chips(entry_id)
+        chips_used = chips_by_entry[entry_id]
         for chip_info in chips_used:
+            if chip_info["event"] not in gameweeks:
+                continue
             chip_data.append(
                 {
                     "entry_id": entry_id,
@@ -122,29 +304,198 @@ def get_league_data(league_id):
     return pd.DataFrame(all_data), pd.DataFrame(chip_data)
 
 
-# Function to get Jager Cup H2H matches data
-def get_jager_cup_data(league_id):
-    """Fetch Jager Cup H2H matches data from FPL API."""
-    url = f"{BASE_URL}/leagues-h2h-matches/league/{league_id}/?page=1"
-    response = requests.get(url)
-    
+# Main function to gather all weekly data
+def get_league_data(
+    league_id,
+    max_workers=1,
+    use_picks_for_chips=False,
+    finished_events=(),
+    known_entries=(),
+    current_event=None,
+):
+    """Fetch weekly scores and chip usage for every manager in a classic league.
+
+    Entries in known_entries are treated as already stored for finished_events,
+    so only their remaining gameweeks are returned (and probed for picks).
+    Gameweeks after current_event are skipped.
+    """
+    league_entries = get_league_entries(league_id)
+    gameweeks_by_entry = get_gameweeks_by_entry(
+        league_entries, finished_events, known_entries, current_event
+    )
+    history_by_entry, chips_by_entry = fetch_entry_data(
+        gameweeks_by_entry, max_workers, use_picks_for_chips
+    )
+    return build_league_data(
+        league_entries, gameweeks_by_entry, history_by_entry, chips_by_entry
+    )
+
+
+# Function to stream a classic league's tables in batches of managers
+def iter_league_batches(
+    league_id,
+    max_workers=1,
+    use_picks_for_chips=False,
+    finished_events=(),
+    known_entries=(),
+    batch_size=STREAM_BATCH_SIZE,
+    skip_entries=(),
+    current_event=None,
+):
+    """Yield (gameweeks_by_entry, weekly_scores, chip_usage) for each batch of managers.
+
+    Standings pages are fetched lazily, so only one batch of entries and
+    histories is held in memory however large the league is. Entries in
+    skip_entries (already saved by an interrupted run) are not fetched.
+    """
+    entries = (
+        entry for entry in iter_league_entries(league_id) if entry["entry"] not in skip_entries
+    )
+    for league_entries in iter_chunks(entries, batch_size):
+        gameweeks_by_entry = get_gameweeks_by_entry(
+            league_entries, finished_events, known_entries, current_event
+        )
+        history_by_entry, chips_by_entry = fetch_entry_data(
+            gameweeks_by_entry, max_workers, use_picks_for_chips
+        )
+        yield (gameweeks_by_entry,) + build_league_data(
+            league_entries, gameweeks_by_entry, history_by_entry, chips_by_entry
+        )
+
+
+# Function to read the previously saved league data for an incremental refresh
+def load_existing_league_data(data_dir=DATA_DIR, columns=None):
+    """Return the saved weekly scores, chip usage and finished gameweeks.
+
+    Tables that haven't been saved (e.g. the scores of a cup-only league) are empty.
+    """
+    tables = []
+    for name, table_columns in (
+        ("weekly_scores", columns),
+        ("chip_usage", columns),
+        ("gameweek_info", None),
+    ):
+        try:
+            tables.append(read_table(name, data_dir, table_columns))
+        except FileNotFoundError:
+            tables.append(pd.DataFrame())
+    df, df_chips, gw_info = tables
+
+    finished_events = (
+        parse_finished_events(gw_info["finished_events"].iloc[0])
+        if not gw_info.empty
+        else []
+    )
+    return df, df_chips, finished_events
+
+
+# Function to merge freshly fetched rows into the saved rows for finished gameweeks
+def merge_league_data(df_existing, df_new, finished_events, entry_ids=None):
+    """Saved rows of finished_events plus df_new.
+
+    With entry_ids, saved rows of managers no longer in the league are dropped.
+    """
+    if df_existing.empty or "event" not in df_existing.columns:
+        return df_new
+    df_kept = df_existing[df_existing["event"].isin(finished_events)]
+    if entry_ids is not None:
+        df_kept = df_kept[df_kept["entry_id"].isin(entry_ids)]
+    if df_kept.empty:
+        return df_new
+    return pd.concat([df_kept, df_new], ignore_index=True)
+
+
+# Function to order league rows the same way whether they were merged or fetched in full
+def sort_league_data(df):
+    if df.empty:
+        return df
+    return df.sort_values(["event", "entry_id"], kind="stable").reset_index(drop=True)
+
+
+# Function to get one page of H2H matches, optionally for a single gameweek
+def get_h2h_matches_page(league_id, page, event=None):
+    url = f"{BASE_URL}/leagues-h2h-matches/league/{league_id}/?page={page}"
+    if event is not None:
+        url = f"{BASE_URL}/leagues-h2h-matches/league/{league_id}/?event={event}&page={page}"
+    response = get_client().get(url)
     if response.status_code == 404:
-        print(f"Jager Cup league {league_id} not found or H2H matches haven't started yet.")
+        return None
+    response.raise_for_status()
+    return response.json()
+
+
+# Function to get every page of H2H matches, following has_next
+def get_h2h_matches(league_id, event=None, max_workers=1):
+    """Return all H2H match results, or None if the league is not found.
+
+    A page past the last one (404) ends the results instead of discarding them.
+    """
+    data = get_h2h_matches_page(league_id, 1, event)
+    if data is None:
+        return None
+
+    results = list(data.get("results", []))
+    page = 1
+    batch_size = 1
+    has_next = data.get("has_next", False)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while has_next:
+            # The page count isn't reported, so fetch growing batches of pages
+            # together and stop at the first one without a next page
+            pages = range(page + 1, page + 1 + batch_size)
+            batch_size = min(batch_size * 2, max_workers)
+            futures = [
+                executor.submit(get_h2h_matches_page, league_id, p, event) for p in pages
+            ]
+            for future in futures:
+                data = future.result()
+                page += 1
+                if data is not None:
+                    results.extend(data.get("results", []))
+                has_next = data is not None and data.get("has_next", False)
+                if not has_next:
+                    break
+            # Pages past the last one aren't needed, so don't wait for them
+            for future in futures:
+                future.cancel()
+    return results
+
+
+# Function to get Jager Cup H2H matches data
+def get_jager_cup_data(league_id, events=None, max_workers=1):
+    """Fetch Jager Cup H2H matches data from FPL API.
+
+    All pages are fetched; pass events to only fetch those gameweeks' matches.
+    """
+    try:
+        if events is None:
+            results = get_h2h_matches(league_id, max_workers=max_workers)
+        else:
+            # Rounds not drawn yet aren't found, which leaves the other rounds' matches
+            found = [
+                event_results
+                for event_results in (
+                    get_h2h_matches(league_id, event, max_workers) for event in events
+                )
+                if event_results is not None
+            ]
+            results = [match for event_results in found for match in event_results] if found else None
+    except requests.HTTPError as e:
+        print(f"Failed to fetch Jager Cup data. {e}")
         return pd.DataFrame()
-    elif response.status_code != 200:
-        print(f"Failed to fetch Jager Cup data. Status code: {response.status_code}")
+
+    if results is None:
+        print(f"Jager Cup league {league_id} not found or H2H matches haven't started yet.")
         return pd.DataFrame()
     
-    data = response.json()
-    
     # Check if there are any results
-    if not data.get("results"):
+    if not results:
         print("No Jager Cup matches found yet.")
         return pd.DataFrame()
     
     matches = []
     
-    for match in data["results"]:
+    for match in results:
         matches.append({
             "event": match["event"],
             "stage": match["knockout_name"],
@@ -169,46 +520,625 @@ def get_jager_cup_data(league_id):
     return df
 
 
-# Example usage
-try:
-    # Get current gameweek information
-    gw_info = get_current_gameweek_info()
-    if gw_info:
-        # Save gameweek info to a JSON-like CSV for easy reading in Streamlit
-        gw_df = pd.DataFrame([{
-            "current_event": gw_info["current_event"],
-            "finished_events": ",".join(map(str, gw_info["finished_events"])) if gw_info["finished_events"] else ""
-        }])
-        gw_df.to_csv("data/gameweek_info.csv", index=False)
-        print(f"Current gameweek: {gw_info['current_event']}, Finished gameweeks: {len(gw_info['finished_events'])}")
+# Function to read the previously saved Jager Cup matches
+def load_existing_cup_data(data_dir=DATA_DIR):
+    try:
+        return read_table("jager_cup_matches", data_dir)
+    except FileNotFoundError:
+        return pd.DataFrame()
+
+
+# Function to replace the saved matches of the refreshed gameweeks with new ones
+def merge_cup_matches(df_existing, df_new, events):
+    if df_existing.empty:
+        return df_new
+    df_kept = df_existing[~df_existing["event"].isin(events)]
+    df_merged = pd.concat([df_new, df_kept], ignore_index=True)
+    # Latest round first, as returned by the API
+    return df_merged.sort_values("event", ascending=False, kind="stable").reset_index(
+        drop=True
+    )
+
+
+# Function to read what a data directory already holds for an incremental refresh
+def get_refresh_state(data_dir, gw_info, incremental=INCREMENTAL, columns=None):
+    """Return the saved tables and what an incremental refresh can keep of them.
+
+    columns limits which columns of the saved weekly scores and chips are read.
+    """
+    df_existing, df_chips_existing, previous_finished = load_existing_league_data(
+        data_dir, columns
+    )
+    df_cup_existing = load_existing_cup_data(data_dir)
+
+    # Only refresh incrementally when there is saved data (league scores or,
+    # for a cup-only directory, cup matches) from this season, i.e. every
+    # gameweek finished last time is still reported as finished
+    incremental = (
+        incremental
+        and gw_info is not None
+        and not (df_existing.empty and df_cup_existing.empty)
+        and set(previous_finished) <= set(gw_info["finished_events"])
+    )
+    return {
+        "data_dir": data_dir,
+        "incremental": incremental,
+        "previous_finished": previous_finished if incremental else [],
+        "finished_events": gw_info["finished_events"] if gw_info else [],
+        "current_event": gw_info["current_event"] if gw_info else None,
+        "known_entries": (
+            set(df_existing["entry_id"]) if incremental and not df_existing.empty else set()
+        ),
+        "weekly_scores": df_existing,
+        "chip_usage": df_chips_existing,
+        "jager_cup_matches": df_cup_existing,
+    }
+
+
+# Function to save the current gameweek information
+def save_gameweek_info(gw_info, data_dir=DATA_DIR):
+    # Save gameweek info as a one-row table for easy reading in Streamlit
+    gw_df = pd.DataFrame([{
+        "current_event": gw_info["current_event"],
+        "finished_events": ",".join(map(str, gw_info["finished_events"])) if gw_info["finished_events"] else "",
+        "season": gw_info.get("season"),
+    }])
+    write_table(gw_df, "gameweek_info", data_dir)
+
+
+# Function to merge and save a classic league's weekly scores and chip usage
+def save_league_data(df, df_chips, state, entry_ids=None):
+    # entry_ids are the league's current managers; saved rows of anyone else are dropped
+    if state["incremental"]:
+        print(f"Incremental refresh of {state['data_dir']}: keeping saved data for {len(state['previous_finished'])} finished gameweeks")
+        df = merge_league_data(state["weekly_scores"], df, state["previous_finished"], entry_ids)
+        df_chips = merge_league_data(state["chip_usage"], df_chips, state["previous_finished"], entry_ids)
+    df = sort_league_data(df)
+    df_chips = sort_league_data(df_chips)
 
-    # Get league weekly scores and chip data
-    df, df_chips = get_league_data(LEAGUE_ID)
-    
     # Check if DataFrame is not empty and has the expected column
     if not df.empty and "player_name" in df.columns:
         df["player_name"] = df["player_name"].str.title()
-    
-    df.to_csv(f"data/weekly_scores.csv", index=False)
+
+    write_table(df, "weekly_scores", state["data_dir"])
 
     if not df_chips.empty:
         if "player_name" in df_chips.columns:
             df_chips["player_name"] = df_chips["player_name"].str.title()
-        df_chips.to_csv(f"data/chip_usage.csv", index=False)
-        print("Successfully updated weekly_scores.csv and chip_usage.csv")
+        write_table(df_chips, "chip_usage", state["data_dir"])
+        print(f"Successfully updated weekly_scores and chip_usage tables in {state['data_dir']}")
+    else:
+        print(f"Successfully updated weekly_scores table in {state['data_dir']} (no chip data found)")
+
+
+# Function to fetch and save several classic leagues, fetching each manager once
+def update_league_data(classic_leagues, states, executor, max_workers=1, use_picks_for_chips=False):
+    # Standings of every classic league, fetched in parallel
+    entries_by_league = dict(
+        zip(classic_leagues, executor.map(get_league_entries, classic_leagues))
+    )
+    gameweeks_by_league = {
+        league_id: get_gameweeks_by_entry(
+            entries,
+            states[league_id]["previous_finished"],
+            states[league_id]["known_entries"],
+            states[league_id]["current_event"],
+        )
+        for league_id, entries in entries_by_league.items()
+    }
+
+    # Fetch each manager once, for every gameweek any of their leagues needs
+    gameweeks_by_entry = {}
+    for league_gameweeks in gameweeks_by_league.values():
+        for entry_id, gameweeks in league_gameweeks.items():
+            merged = set(gameweeks_by_entry.get(entry_id, [])) | set(gameweeks)
+            gameweeks_by_entry[entry_id] = sorted(merged)
+    print(f"Fetching {len(gameweeks_by_entry)} managers across {len(classic_leagues)} leagues")
+    history_by_entry, chips_by_entry = fetch_entry_data(
+        gameweeks_by_entry, max_workers, use_picks_for_chips
+    )
+
+    # Build and save each league's tables in parallel
+    def save_league(league_id):
+        entries = entries_by_league[league_id]
+        df, df_chips = build_league_data(
+            entries, gameweeks_by_league[league_id], history_by_entry, chips_by_entry
+        )
+        entry_ids = [entry["entry"] for entry in entries]
+        save_league_data(df, df_chips, states[league_id], entry_ids)
+
+    list(executor.map(save_league, classic_leagues))
+
+
+# Function to stream a classic league to part files and compact them into its tables
+def stream_league_data(
+    league_id, state, max_workers=1, use_picks_for_chips=False, batch_size=STREAM_BATCH_SIZE
+):
+    """Save a classic league batch by batch, keeping memory flat.
+
+    Each batch is written to data/<table>.parts/ as it arrives and its
+    (entry, endpoint, gameweek) units are recorded in the checkpoint journal,
+    so a rerun after a crash skips the saved managers and carries on. The parts
+    are compacted into the tables at the end, after the rows an incremental
+    refresh keeps.
+    """
+    data_dir = state["data_dir"]
+    table_names = ("weekly_scores", "chip_usage")
+    journal = CrawlJournal(data_dir)
+
+    # Progress can only be reused by a run that would fetch the same gameweeks
+    signature = json.dumps(
+        {
+            "finished_events": sorted(state["finished_events"]),
+            "previous_finished": sorted(state["previous_finished"]),
+            "use_picks_for_chips": use_picks_for_chips,
+        }
+    )
+    if journal.start(league_id, signature):
+        saved_parts = journal.saved_parts(league_id)
+        skip_entries = journal.done_entries(league_id)
+        print(f"Resuming league {league_id}: {len(skip_entries)} managers already saved")
     else:
-        print("Successfully updated weekly_scores.csv (no chip data found)")
+        saved_parts, skip_entries = set(), set()
+    # Parts written after the journal's last record hold unrecorded work
+    for name in table_names:
+        prune_parts(name, saved_parts, data_dir)
+
+    batches = iter_league_batches(
+        league_id,
+        max_workers,
+        use_picks_for_chips,
+        state["previous_finished"],
+        state["known_entries"],
+        batch_size,
+        skip_entries,
+        state["current_event"],
+    )
+    # Every manager in the standings, so saved rows of managers who left are dropped
+    entry_ids = set(skip_entries)
+    first_part = max(saved_parts, default=-1) + 1
+    for part, (gameweeks_by_entry, df, df_chips) in enumerate(batches, first_part):
+        entry_ids.update(gameweeks_by_entry)
+        for name, table in zip(table_names, (df, df_chips)):
+            if table.empty:
+                continue
+            table["player_name"] = table["player_name"].str.title()
+            write_part(table, name, part, data_dir)
+        # Gameweek 0 stands for endpoints that cover the whole season
+        units = []
+        for entry_id, gameweeks in gameweeks_by_entry.items():
+            units.append((entry_id, "history", 0))
+            if use_picks_for_chips:
+                units.extend((entry_id, "picks", gw) for gw in gameweeks)
+        journal.record_batch(league_id, part, units)
+        print(f"Saved batch {part + 1} of league {league_id} ({len(df)} weekly rows)")
+
+    keep_events = state["previous_finished"] if state["incremental"] else None
+    compacted = journal.compacted_tables(league_id)
+    for name in table_names:
+        if name in compacted:
+            continue
+        if compact_parts(name, data_dir, keep_events, entry_ids):
+            print(f"Successfully updated {name} table in {data_dir}")
+        journal.mark_compacted(league_id, name)
+    journal.finish(league_id)
+    journal.close()
+
+
+# Function to fetch, merge and save an H2H cup league's matches
+def update_cup_data(league_id, state, gw_info, max_workers=1):
+    # Once the cup has started, an incremental refresh only pulls the rounds of
+    # unfinished gameweeks (and the next one)
+    df_cup_existing = state["jager_cup_matches"]
+    cup_events = None
+    if state["incremental"] and not df_cup_existing.empty and gw_info["current_event"]:
+        cup_events = [
+            gw
+            for gw in ALL_GAMEWEEKS
+            if gw not in state["previous_finished"] and gw <= gw_info["current_event"] + 1
+        ]
+    df_jager_cup = get_jager_cup_data(league_id, events=cup_events, max_workers=max_workers)
+    if cup_events is not None and not df_jager_cup.empty:
+        df_jager_cup = merge_cup_matches(df_cup_existing, df_jager_cup, cup_events)
 
-    # Get Jager Cup data
-    df_jager_cup = get_jager_cup_data(JAGER_CUP_LEAGUE_ID)
     if not df_jager_cup.empty:
-        df_jager_cup.to_csv("data/jager_cup_matches.csv", index=False)
-        print("Successfully updated jager_cup_matches.csv")
+        write_table(df_jager_cup, "jager_cup_matches", state["data_dir"])
+        print(f"Successfully updated jager_cup_matches table in {state['data_dir']}")
     else:
         print("No Jager Cup data found or failed to fetch")
 
-except Exception as e:
-    print(f"Error occurred: {e}")
-    import traceback
-    traceback.print_exc()
-    print("Script terminated early due to error")
+
+# Function to rebuild the derived tables and league database of a data directory
+def save_league_tables(data_dir, finished_events, streaming=False, chip_periods=CHIP_PERIODS):
+    """Write the derived league tables and league.db of a data directory.
+
+    chip_periods are the gameweek ranges of the chip summary's columns.
+
+    With streaming=True the weekly scores are never loaded whole: league.db is
+    built a record batch at a time and the tables summarising the scores are
+    queried from it. event_ranks, as large as the scores themselves, isn't
+    written then; the pages query league.db for top finishes instead.
+    """
+    def read_optional(name):
+        try:
+            return read_table(name, data_dir)
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+    df_chips = read_optional("chip_usage")
+    df_cup = read_optional("jager_cup_matches")
+    if streaming:
+        # Indexed copy for the queries that only need a few rows, e.g. one manager's
+        league_tables = {}
+        if league_db.build_database(league_db.weekly_score_batches(data_dir), finished_events, data_dir):
+            print(f"Successfully updated the league database in {data_dir}")
+            with closing(league_db.connect(league_db.db_path(data_dir))) as conn:
+                league_tables = score_tables(
+                    league_db.top_scores(conn), league_db.manager_points(conn), df_chips, chip_periods
+                )
+        if not df_cup.empty:
+            league_tables["cup_matches"] = cup_display_table(df_cup)
+    else:
+        # Materialise the derived tables so the pages only filter and render
+        df_weekly_scores = read_optional("weekly_scores")
+        league_tables = build_league_tables(
+            df_weekly_scores, df_chips, df_cup, finished_events, chip_periods
+        )
+        if not df_weekly_scores.empty:
+            league_db.build_database([df_weekly_scores], finished_events, data_dir)
+            print(f"Successfully updated the league database in {data_dir}")
+
+    for name, table in league_tables.items():
+        write_table(table, name, data_dir, csv=False)
+    # Tables the data no longer has a source for would otherwise go stale
+    for name in LEAGUE_TABLES:
+        if name not in league_tables:
+            remove_table(name, data_dir)
+    print(f"Successfully updated {len(league_tables)} derived league tables in {data_dir}")
+
+
+# Function to get the live points of every player in a gameweek
+def get_live_event(gw):
+    url = f"{BASE_URL}/event/{gw}/live/"
+    r = get_client().get(url)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    return r.json()
+
+
+# Function to read the picks saved by a previous live refresh of a gameweek
+def load_live_picks(event, data_dir=DATA_DIR):
+    try:
+        df_picks = read_table("live_picks", data_dir)
+    except FileNotFoundError:
+        return pd.DataFrame()
+    return df_picks[df_picks["event"] == event]
+
+
+# Function to read a league's managers from its saved data, shaped like standings entries
+def load_league_entries(data_dir=DATA_DIR):
+    """Return the saved managers of a league, or None if nothing is saved yet."""
+    path = league_db.db_path(data_dir)
+    if os.path.exists(path):
+        with closing(league_db.connect(path)) as conn:
+            df_managers = league_db.managers(conn)
+    else:
+        try:
+            df_managers = read_table(
+                "weekly_scores", data_dir, ["entry_id", "player_name", "team_name"]
+            ).drop_duplicates("entry_id", keep="last")
+        except FileNotFoundError:
+            return None
+    if df_managers.empty:
+        return None
+    return [
+        {"entry": int(entry_id), "player_name": str(player_name), "entry_name": str(team_name)}
+        for entry_id, player_name, team_name in zip(
+            df_managers["entry_id"], df_managers["player_name"], df_managers["team_name"]
+        )
+    ]
+
+
+# Function to score a classic league's current gameweek from the live data
+def update_live_scores(league_id, state, gw_info, max_workers=1):
+    """Save the provisional scores of an unfinished current gameweek; returns whether it did.
+
+    The live player points are fetched once per refresh and each manager's
+    picks once per gameweek (they are kept in the live_picks table). The
+    managers are those of the saved league data, whose standings the league
+    refresh has just paged, so a refresh costs one request plus one per
+    manager new to the league; the standings are only fetched here when
+    nothing has been saved yet.
+    """
+    event = gw_info["current_event"]
+    if not event or event in gw_info["finished_events"]:
+        return False
+    live = get_live_event(event)
+    if live is None:
+        print(f"No live data for gameweek {event} yet")
+        return False
+
+    data_dir = state["data_dir"]
+    league_entries = load_league_entries(data_dir)
+    if league_entries is None:
+        league_entries = get_league_entries(league_id)
+    df_saved = load_live_picks(event, data_dir)
+    saved_entries = set(df_saved["entry_id"]) if not df_saved.empty else set()
+    missing = [entry["entry"] for entry in league_entries if entry["entry"] not in saved_entries]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        picks = executor.map(lambda entry_id: get_gameweek_picks(entry_id, event), missing)
+        df_new = picks_table(dict(zip(missing, picks)), event)
+    df_picks = pd.concat([df_saved, df_new], ignore_index=True) if not df_saved.empty else df_new
+    if df_picks.empty:
+        print(f"No picks found for gameweek {event}")
+        return False
+    write_table(df_picks, "live_picks", data_dir, csv=False)
+
+    df_live = live_scores(df_picks, live_element_points(live))
+    write_table(live_leaderboard(df_live, league_entries), "live_scores", data_dir, csv=False)
+    print(f"Successfully updated live scores for gameweek {event} in {data_dir} ({len(missing)} picks fetched)")
+    return True
+
+
+# Function to get the partition directory of a league, e.g. data/2025-26/43344
+def get_partition_dir(data_dir, season, league_id):
+    return os.path.join(data_dir, season, str(league_id))
+
+
+# Driver to ingest any number of classic and H2H leagues
+def ingest(
+    classic_leagues=(LEAGUE_ID,),
+    h2h_leagues=(JAGER_CUP_LEAGUE_ID,),
+    seasons=None,
+    data_dir=DATA_DIR,
+    partitioned=None,
+    max_workers=MAX_WORKERS,
+    incremental=INCREMENTAL,
+    use_picks_for_chips=USE_PICKS_FOR_CHIPS,
+    streaming=False,
+    batch_size=STREAM_BATCH_SIZE,
+    live=LIVE_SCORES,
+    live_only=False,
+    chip_periods=CHIP_PERIODS,
+):
+    """Fetch and save the tables for the given classic and H2H leagues.
+
+    Managers in several classic leagues have their history fetched only once.
+    League standings and cup matches are fetched, and the leagues' tables
+    built and saved, in parallel. With one
+    classic and one H2H league the tables go straight into data_dir (the layout
+    the app reads); otherwise, or with partitioned=True, each league is written
+    to data_dir/<season>/<league>/. The FPL API only serves the current season,
+    so other requested seasons are skipped.
+
+    With streaming=True each classic league is fetched and written in batches
+    of batch_size managers (see stream_league_data), so memory does not grow
+    with league size; managers shared between leagues are then served by the
+    response cache instead of being deduplicated up front.
+
+    With live=True, a current gameweek in progress is also scored from the
+    live player points (see update_live_scores). With live_only=True that is
+    all that's done: only the live points and any missing picks are fetched,
+    for a cheap refresh between full ones while a gameweek is in progress.
+
+    chip_periods are the gameweek ranges shown as separate columns of the chip
+    summary, checked before anything is fetched.
+
+    With the default layout the season is then archived and the all-time
+    tables rebuilt (see archive.py). Once every table of a directory is
+    written it is published as a new snapshot (see data_store.publish_snapshot),
+    so the app never reads a mix of tables from two refreshes; until then the
+    directory is marked as being ingested (see data_store.begin_ingest).
+    """
+    validate_chip_periods(chip_periods)
+
+    # Get current gameweek information
+    with timed("ingest/gameweek_info"):
+        gw_info = get_current_gameweek_info()
+    if gw_info:
+        print(f"Current gameweek: {gw_info['current_event']}, Finished gameweeks: {len(gw_info['finished_events'])}")
+    season = gw_info["season"] if gw_info else None
+
+    if seasons:
+        skipped = [s for s in seasons if s != season]
+        if skipped:
+            print(f"Only the current season ({season}) is available from the FPL API, skipping {', '.join(skipped)}")
+        if season not in seasons:
+            return
+
+    if partitioned is None:
+        partitioned = len(classic_leagues) > 1 or len(h2h_leagues) > 1 or bool(seasons)
+    if partitioned and season is None:
+        print("Could not determine the season, so partitioned output is not possible")
+        return
+
+    def league_dir(league_id):
+        return get_partition_dir(data_dir, season, league_id) if partitioned else data_dir
+
+    if live_only:
+        if not gw_info:
+            return
+        for league_id in classic_leagues:
+            begin_ingest(league_dir(league_id))
+        pool_size = max(1, min(max_workers, len(classic_leagues)))
+        with timed("ingest/live"):
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                updated = list(
+                    executor.map(
+                        lambda league_id: update_live_scores(
+                            league_id, {"data_dir": league_dir(league_id)}, gw_info, max_workers
+                        ),
+                        classic_leagues,
+                    )
+                )
+        for league_id, is_updated in zip(classic_leagues, updated):
+            end_ingest(league_dir(league_id))
+            if is_updated:
+                version = publish_snapshot(league_dir(league_id))
+                print(f"Published snapshot {version} of {league_dir(league_id)}")
+        return
+
+    # Read what previous runs saved before anything gets overwritten
+    # A streaming ingest only needs to know which entries and gameweeks exist
+    columns = ["entry_id", "event"] if streaming else None
+    states = {
+        league_id: get_refresh_state(league_dir(league_id), gw_info, incremental, columns)
+        for league_id in list(classic_leagues) + list(h2h_leagues)
+    }
+    output_dirs = sorted({state["data_dir"] for state in states.values()})
+    # Readers stay on the last snapshot until the tables are all written
+    for output_dir in output_dirs:
+        begin_ingest(output_dir)
+
+    pool_size = max(1, min(max_workers, len(classic_leagues) + len(h2h_leagues)))
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        # Cup leagues are fetched in parallel, alongside the classic leagues
+        cup_futures = [
+            executor.submit(update_cup_data, league_id, states[league_id], gw_info, max_workers)
+            for league_id in h2h_leagues
+        ]
+        with timed("ingest/leagues"):
+            if streaming:
+                list(
+                    executor.map(
+                        lambda league_id: stream_league_data(
+                            league_id,
+                            states[league_id],
+                            max_workers,
+                            use_picks_for_chips,
+                            batch_size,
+                        ),
+                        classic_leagues,
+                    )
+                )
+            elif classic_leagues:
+                update_league_data(
+                    classic_leagues, states, executor, max_workers, use_picks_for_chips
+                )
+
+        # Time spent waiting for the cups once the classic leagues are done
+        with timed("ingest/cups"):
+            for future in cup_futures:
+                future.result()
+
+    # Saved last, so an interrupted run never marks gameweeks as stored
+    if gw_info:
+        for output_dir in output_dirs:
+            save_gameweek_info(gw_info, output_dir)
+
+    finished_events = gw_info["finished_events"] if gw_info else None
+    with timed("ingest/derived_tables"):
+        for output_dir in output_dirs:
+            save_league_tables(output_dir, finished_events, streaming, chip_periods)
+
+    # Scored once the league data is saved, so the managers are read from it
+    if live and gw_info:
+        with timed("ingest/live"):
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                list(
+                    executor.map(
+                        lambda league_id: update_live_scores(
+                            league_id, states[league_id], gw_info, max_workers
+                        ),
+                        classic_leagues,
+                    )
+                )
+
+    # Keep this season's tables in the archive and update the all-time tables
+    if not partitioned and season:
+        with timed("ingest/archive"):
+            if archive_season(season, data_dir, data_dir):
+                save_alltime_tables(data_dir)
+
+    # The app reads the tables of a directory from its current snapshot
+    for output_dir in output_dirs:
+        end_ingest(output_dir)
+        version = publish_snapshot(output_dir)
+        print(f"Published snapshot {version} of {output_dir}")
+
+
+# Function to parse a --chip-period value such as 1-19
+def parse_chip_period(value):
+    try:
+        gw_start, gw_end = (int(gw) for gw in value.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected START-END gameweeks, such as 1-19, got {value!r}")
+    return gw_start, gw_end
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch FPL league data into the data directory.")
+    parser.add_argument("--league", type=int, action="append", dest="classic_leagues", help="Classic league ID (repeatable)")
+    parser.add_argument("--h2h-league", type=int, action="append", dest="h2h_leagues", help="H2H/cup league ID (repeatable)")
+    parser.add_argument("--season", action="append", dest="seasons", help="Season label such as 2025-26 (repeatable)")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--partitioned", action="store_true", default=None, help="Write to <data-dir>/<season>/<league>/")
+    parser.add_argument("--max-workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--full", action="store_true", help="Refetch everything instead of refreshing incrementally")
+    parser.add_argument("--picks-for-chips", action="store_true", default=USE_PICKS_FOR_CHIPS, help="Probe every gameweek's picks for chips")
+    parser.add_argument("--stream", action="store_true", help="Fetch and write classic leagues in batches to bound memory")
+    parser.add_argument("--batch-size", type=int, default=STREAM_BATCH_SIZE, help="Managers per batch when streaming")
+    parser.add_argument("--no-live", action="store_false", dest="live", default=LIVE_SCORES, help="Don't score the current gameweek from live data")
+    parser.add_argument("--live-only", action="store_true", help="Only score the current gameweek from live data")
+    parser.add_argument("--chip-period", type=parse_chip_period, action="append", dest="chip_periods", metavar="START-END", help="Gameweeks of a chip summary column, such as 1-19 (repeatable, default: halves of the season)")
+    args = parser.parse_args(argv)
+    try:
+        validate_chip_periods(args.chip_periods or CHIP_PERIODS)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+# Function to run one ingest and write its run report, without raising
+def run_ingest(data_dir=DATA_DIR, **kwargs):
+    """Run ingest(data_dir=data_dir, **kwargs) and return its run report.
+
+    Errors are printed and recorded in the report instead of being raised, so a
+    failed refresh still reports what it fetched.
+    """
+    reset("ingest/")
+    error = None
+    try:
+        ingest(data_dir=data_dir, **kwargs)
+    except Exception as e:
+        error = str(e)
+        print(f"Error occurred: {e}")
+        import traceback
+        traceback.print_exc()
+        print("Script terminated early due to error")
+
+    # Request and stage metrics of this run, shown on the diagnostics page
+    return write_run_report(data_dir, error, kwargs.get("live_only", False))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Without any leagues, fetch the Jager Crew league and cup as before
+    if not args.classic_leagues and not args.h2h_leagues:
+        args.classic_leagues = [LEAGUE_ID]
+        args.h2h_leagues = [JAGER_CUP_LEAGUE_ID]
+    report = run_ingest(
+        classic_leagues=args.classic_leagues or [],
+        h2h_leagues=args.h2h_leagues or [],
+        seasons=args.seasons,
+        data_dir=args.data_dir,
+        partitioned=args.partitioned,
+        max_workers=args.max_workers,
+        incremental=not args.full,
+        use_picks_for_chips=args.picks_for_chips,
+        streaming=args.stream,
+        batch_size=args.batch_size,
+        live=args.live,
+        live_only=args.live_only,
+        chip_periods=args.chip_periods or CHIP_PERIODS,
+    )
+    requests_made = sum(stats["requests"] for stats in report["endpoints"].values())
+    print(f"Run report: {requests_made} requests in {report['duration_seconds']}s")
+    # Fail the scheduled job, so a broken run doesn't look like a successful one
+    if report["error"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Lightweight timing and request metrics for the ingest and the pages."""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+RUN_REPORT_NAME = "run_report.json"
+
+# Upper bounds (milliseconds) of the request latency histogram buckets
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# FPL API endpoints, first match wins
+ENDPOINTS = [
+    ("bootstrap-static", r"/bootstrap-static/"),
+    ("standings", r"/leagues-classic/\d+/standings/"),
+    ("h2h-matches", r"/leagues-h2h-matches/league/\d+/"),
+    ("history", r"/entry/\d+/history/"),
+    ("picks", r"/entry/\d+/event/\d+/picks/"),
+    ("live", r"/event/\d+/live/"),
+]
+
+_lock = threading.Lock()
+_started_at = time.time()
+_requests = {}
+_stages = {}
+
+
+def endpoint_name(url):
+    for name, pattern in ENDPOINTS:
+        if re.search(pattern, url):
+            return name
+    return "other"
+
+
+def reset(prefix=""):
+    """Forget the requests and the stages under prefix, e.g. at the start of an ingest."""
+    global _started_at
+    with _lock:
+        _started_at = time.time()
+        _requests.clear()
+        for stage in [stage for stage in _stages if stage.startswith(prefix)]:
+            del _stages[stage]
+
+
+def record_request(url, seconds, status_code, nbytes, cache_status):
+    """Record one API call; cache_status is HIT, REVALIDATED or MISS."""
+    name = endpoint_name(url)
+    with _lock:
+        stats = _requests.setdefault(
+            name,
+            {
+                "requests": 0,
+                "errors": 0,
+                "bytes": 0,
+                "seconds": 0.0,
+                "cache": {"HIT": 0, "REVALIDATED": 0, "MISS": 0},
+                "latency_ms": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            },
+        )
+        stats["requests"] += 1
+        stats["errors"] += status_code >= 400
+        stats["bytes"] += nbytes
+        stats["seconds"] += seconds
+        stats["cache"][cache_status] = stats["cache"].get(cache_status, 0) + 1
+        bucket = sum(seconds * 1000 > bound for bound in LATENCY_BUCKETS_MS)
+        stats["latency_ms"][bucket] += 1
+
+
+def record_stage(stage, seconds):
+    with _lock:
+        stats = _stages.setdefault(
+            stage, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "last_seconds": 0.0}
+        )
+        stats["count"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        stats["last_seconds"] = seconds
+
+
+@contextmanager
+def timed(stage):
+    """Time a block under a stage name such as "ingest/derived" or "page/cup/render"."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def request_stats():
+    """Per-endpoint request counts, bytes, cache hit rate and latency histogram."""
+    labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+    with _lock:
+        report = {}
+        for name, stats in _requests.items():
+            hits = stats["cache"]["HIT"] + stats["cache"]["REVALIDATED"]
+            report[name] = dict(
+                stats,
+                cache=dict(stats["cache"]),
+                cache_hit_rate=round(hits / stats["requests"], 3),
+                mean_ms=round(stats["seconds"] * 1000 / stats["requests"], 1),
+                latency_ms=dict(zip(labels, stats["latency_ms"])),
+            )
+        return report
+
+
+def stage_stats(prefix=""):
+    with _lock:
+        return {
+            stage: dict(stats) for stage, stats in _stages.items() if stage.startswith(prefix)
+        }
+
+
+def write_run_report(data_dir, error=None, live_only=False):
+    """Write the metrics recorded since the last reset() to data_dir/run_report.json."""
+    finished_at = time.time()
+    report = {
+        "started_at": _started_at,
+        "finished_at": finished_at,
+        "duration_seconds": round(finished_at - _started_at, 3),
+        "live_only": live_only,
+        "error": error,
+        "endpoints": request_stats(),
+        "stages": stage_stats("ingest/"),
+    }
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, RUN_REPORT_NAME)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+    return report
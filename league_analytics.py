@@ -0,0 +1,426 @@
+"""Derived league tables, computed once at ingest time and read by the pages."""
+
+import numpy as np
+import pandas as pd
+
+WEEKLY_PRIZE = 10  # Pounds shared between the managers with the top score each week
+
+CHIP_MAPPING = {
+    "bboost": "🚀 Bench Boost",
+    "freehit": "🎯 Free Hit",
+    "3xc": "👑 Triple Captain",
+    "wildcard": "🔄 Wildcard",
+}
+
+# Gameweek ranges (inclusive) shown as separate columns in the chip summary,
+# unless the ingest is given others (initial_setup.py --chip-period)
+CHIP_PERIODS = [(1, 19), (20, 38)]
+
+# Display order of chips and their emoji in the summary table
+CHIP_ORDER = [
+    ("🚀 Bench Boost", "🚀"),
+    ("🎯 Free Hit", "🎯"),
+    ("👑 Triple Captain", "👑"),
+    ("🔄 Wildcard", "🔄"),
+]
+
+# Columns of a season summary; every column after player_name is a count or sum
+SEASON_SUMMARY_COLUMNS = [
+    "season",
+    "player_name",
+    "gameweeks",
+    "points",
+    "best_gameweek",
+    "top_finishes",
+    "weekly_wins",
+    "weekly_prizes",
+    "cup_match_wins",
+    "cup_titles",
+]
+
+# Every table build_league_tables can produce
+LEAGUE_TABLES = [
+    "weekly_winners",
+    "weekly_prizes",
+    "event_ranks",
+    "chip_summary",
+    "chip_timeline",
+    "cup_matches",
+]
+
+
+def completed_scores(df_weekly_scores, finished_events):
+    """Keep finished gameweeks only; None means the status is unknown, keep all."""
+    if finished_events is None:
+        return df_weekly_scores
+    return df_weekly_scores[df_weekly_scores["event"].isin(finished_events)]
+
+
+def weekly_winners(df_completed):
+    """Top scorer(s) of every gameweek with their share of the weekly prize."""
+    df_weekly_winner = df_completed[
+        df_completed["points"]
+        == df_completed.groupby("event")["points"].transform("max")
+    ]
+    df_weekly_winner = df_weekly_winner.sort_values(by="event", kind="stable")[
+        ["event", "player_name", "points"]
+    ]
+    event_counts = df_weekly_winner.groupby("event")["player_name"].transform("count")
+
+    # Assign £10 / number of winners for each row
+    df_weekly_winner["prize"] = WEEKLY_PRIZE / event_counts
+    return df_weekly_winner.reset_index(drop=True)
+
+
+def weekly_prize_totals(df_weekly_winner):
+    """Total weekly winnings per manager, highest first."""
+    df_weekly_prizes = (
+        df_weekly_winner.groupby("player_name", observed=True)["prize"]
+        .sum()
+        .reset_index()
+    )
+    return df_weekly_prizes.sort_values(by="prize", ascending=False).reset_index(
+        drop=True
+    )
+
+
+def event_ranks(df_completed):
+    """Rank of every manager in every gameweek (ties share the best rank)."""
+    df_ranks = df_completed[["event", "player_name", "points"]].copy()
+    df_ranks["rank"] = (
+        df_ranks.groupby("event")["points"]
+        .rank(method="min", ascending=False)
+        .astype(int)
+    )
+    return df_ranks.sort_values(
+        ["event", "points"], ascending=[True, False], kind="stable"
+    ).reset_index(drop=True)
+
+
+def top_finishes(df_event_ranks, player_name, top_n=5):
+    """Gameweeks where a manager finished in the top N, plus each week's top group.
+
+    Ties share the best rank, so rank <= top_n keeps everyone tied at the cut-off.
+    Returns (my_weeks, top_groups): my_weeks has event/rank/points per gameweek and
+    top_groups has every top-N row for those gameweeks, ordered by event and points.
+    """
+    df_top = df_event_ranks[df_event_ranks["rank"] <= top_n]
+    my_weeks = (
+        df_top.loc[df_top["player_name"] == player_name, ["event", "rank", "points"]]
+        .sort_values("event", kind="stable")
+        .reset_index(drop=True)
+    )
+    top_groups = df_top[df_top["event"].isin(my_weeks["event"])].reset_index(drop=True)
+    return my_weeks, top_groups
+
+
+def chip_display_names(df_chips):
+    """Add a chip_display column and drop the "manager" pseudo chip."""
+    df_chips = df_chips.copy()
+    df_chips["chip"] = df_chips["chip"].astype(str)
+    df_chips["chip_display"] = df_chips["chip"].map(CHIP_MAPPING)
+    df_chips["chip_display"] = df_chips["chip_display"].fillna(df_chips["chip"])
+
+    # Filter out "manager" chip as it's not a real FPL chip
+    return df_chips[df_chips["chip"] != "manager"]
+
+
+def chip_period_label(period):
+    gw_start, gw_end = period
+    return f"Chips GW {gw_start}-{gw_end}"
+
+
+def validate_chip_periods(periods):
+    """Raise ValueError unless periods are ascending, non-overlapping gameweek ranges."""
+    previous_end = None
+    for gw_start, gw_end in periods:
+        if gw_start > gw_end or (previous_end is not None and gw_start <= previous_end):
+            raise ValueError(
+                f"Chip periods must be ascending, non-overlapping (start, end) gameweek ranges, got {periods}"
+            )
+        previous_end = gw_end
+
+
+def chip_period_strings(df_chips, periods=CHIP_PERIODS):
+    """Emoji string of the chips each manager used in each period.
+
+    Counts are pivoted once by manager, period and chip, so the strings for all
+    managers are built together. Returns one row per manager and one column per
+    period (named by chip_period_label); managers without chips are absent, as
+    are chips played in a gameweek outside every period.
+    """
+    validate_chip_periods(periods)
+    labels = [chip_period_label(period) for period in periods]
+    if df_chips.empty:
+        return pd.DataFrame(columns=["Manager"] + labels)
+
+    events = df_chips["event"].to_numpy()
+    in_period = [(events >= gw_start) & (events <= gw_end) for gw_start, gw_end in periods]
+    period = pd.Categorical(np.select(in_period, labels, default=None), categories=labels)
+    chip_counts = (
+        df_chips.assign(period=period)
+        .groupby(["player_name", "period", "chip_display"], observed=True)
+        .size()
+        .unstack("chip_display", fill_value=0)
+    )
+
+    # Repeat each emoji by its count, in the chip order, and join with spaces
+    chip_strings = pd.Series("", index=chip_counts.index)
+    for chip_name, emoji in CHIP_ORDER:
+        if chip_name in chip_counts.columns:
+            repeated = pd.Series(emoji, index=chip_counts.index).str.repeat(
+                chip_counts[chip_name]
+            )
+            chip_strings = chip_strings.str.cat(repeated, sep=" ")
+    chip_strings = chip_strings.str.split().str.join(" ")
+
+    df_periods = chip_strings.unstack("period", fill_value="")
+    df_periods = df_periods.reindex(columns=labels, fill_value="")
+    df_periods.columns = list(df_periods.columns)
+    return df_periods.rename_axis("Manager").reset_index()
+
+
+def chip_summary(df_chips, df_weekly_scores, periods=CHIP_PERIODS):
+    """Chips used by every manager in each period of the season, ranked by points."""
+    all_managers = df_weekly_scores["player_name"].unique()
+    chip_summary = pd.DataFrame({"Manager": all_managers})
+
+    # Add total points column
+    total_points = (
+        df_weekly_scores.groupby("player_name", observed=True)["total_points"]
+        .max()
+        .reset_index()
+        .rename(columns={"player_name": "Manager"})
+    )
+    chip_summary = chip_summary.merge(total_points, on="Manager", how="left")
+    chip_summary["total_points"] = chip_summary["total_points"].fillna(0).astype(int)
+
+    # Create chips columns for each period
+    labels = [chip_period_label(period) for period in periods]
+    chip_summary = chip_summary.merge(
+        chip_period_strings(df_chips, periods), on="Manager", how="left"
+    )
+    chip_summary[labels] = chip_summary[labels].fillna("")
+
+    # Sort by total points (descending) and add rank
+    chip_summary = chip_summary.sort_values("total_points", ascending=False)
+    chip_summary["Rank"] = range(1, len(chip_summary) + 1)
+
+    return chip_summary[["Rank", "Manager", "total_points"] + labels].reset_index(
+        drop=True
+    )
+
+
+def chip_timeline(df_chips):
+    """Number of each chip played in every gameweek."""
+    if df_chips.empty:
+        return pd.DataFrame(
+            {
+                "event": pd.Series(dtype="int64"),
+                "chip_display": pd.Series(dtype="object"),
+                "count": pd.Series(dtype="int64"),
+            }
+        )
+    timeline_data = (
+        df_chips.groupby(["event", "chip_display"]).size().reset_index(name="count")
+    )
+    timeline_data["count"] = timeline_data["count"].astype(int)
+    return timeline_data
+
+
+def cup_display_table(df_cup):
+    """Jager Cup matches with the column names used on the cup page."""
+    df_display = df_cup.rename(
+        columns={
+            "event": "Week",
+            "stage": "Stage",
+            "entry_1_player_name": "Player 1",
+            "entry_1_team_name": "Team 1",
+            "entry_1_points": "Points 1",
+            "entry_2_player_name": "Player 2",
+            "entry_2_team_name": "Team 2",
+            "entry_2_points": "Points 2",
+            "winner": "Winner",
+            "is_bye": "Is Bye",
+        }
+    )[
+        [
+            "Week",
+            "Stage",
+            "Player 1",
+            "Team 1",
+            "Points 1",
+            "Player 2",
+            "Team 2",
+            "Points 2",
+            "Winner",
+            "Is Bye",
+        ]
+    ]
+    df_display = df_display.astype({"Player 1": object, "Player 2": object})
+    df_display["Player 1"] = df_display["Player 1"].fillna("")
+    df_display["Player 2"] = df_display["Player 2"].fillna("")
+
+    # Sort by week
+    return df_display.sort_values(["Week"], kind="stable").reset_index(drop=True)
+
+
+def cup_view_model(df_display):
+    """Per-stage records the cup page renders, in stage order.
+
+    Returns a list of {"stage", "matches", "byes"} dicts. Each match has both
+    players' names and points, and a mark_1/mark_2 winner emoji (empty for the
+    loser and for draws); byes are the sorted names of managers with a bye.
+    """
+    if df_display.empty:
+        return []
+    points_1 = df_display["Points 1"].to_numpy()
+    points_2 = df_display["Points 2"].to_numpy()
+    image = np.where(df_display["Stage"].astype(str) == "Final", "🏆 ", "✅ ")
+    df_view = pd.DataFrame(
+        {
+            "stage": df_display["Stage"].astype(str),
+            "is_bye": df_display["Is Bye"].astype(bool),
+            "player_1": df_display["Player 1"],
+            "points_1": points_1,
+            "mark_1": np.where(points_1 > points_2, image, ""),
+            "player_2": df_display["Player 2"],
+            "points_2": points_2,
+            "mark_2": np.where(points_2 > points_1, image, ""),
+        }
+    )
+
+    match_columns = ["player_1", "points_1", "mark_1", "player_2", "points_2", "mark_2"]
+    view_model = []
+    for stage, df_stage in df_view.groupby("stage", sort=False):
+        df_matches = df_stage[~df_stage["is_bye"]]
+        df_byes = df_stage[df_stage["is_bye"]]
+        view_model.append(
+            {
+                "stage": stage,
+                "matches": df_matches[match_columns].to_dict("records"),
+                "byes": sorted(df_byes["player_1"]),
+            }
+        )
+    return view_model
+
+
+def cup_wins(df_cup, finished_events):
+    """Cup matches won and titles (finals won) per manager, from finished gameweeks."""
+    df_played = df_cup[df_cup["winner"].notna() & ~df_cup["is_bye"].astype(bool)]
+    if finished_events is not None:
+        df_played = df_played[df_played["event"].isin(finished_events)]
+    winner = df_played["winner"].astype(float)
+    df_won = pd.DataFrame(
+        {
+            "player_name": np.where(
+                winner == df_played["entry_1_id"].astype(float),
+                df_played["entry_1_player_name"].astype(object),
+                df_played["entry_2_player_name"].astype(object),
+            ),
+            "is_final": df_played["stage"].astype(str) == "Final",
+        }
+    )
+    return df_won.groupby("player_name").agg(
+        cup_match_wins=("is_final", "size"), cup_titles=("is_final", "sum")
+    )
+
+
+def manager_season_stats(df_event_ranks, top_n=5):
+    """Gameweeks played, points, best gameweek and top-N finishes of every manager."""
+    df_ranks = df_event_ranks.assign(
+        player_name=df_event_ranks["player_name"].astype(str),
+        is_top=df_event_ranks["rank"] <= top_n,
+    )
+    return (
+        df_ranks.groupby("player_name")
+        .agg(
+            gameweeks=("event", "size"),
+            points=("points", "sum"),
+            best_gameweek=("points", "max"),
+            top_finishes=("is_top", "sum"),
+        )
+        .reset_index()
+    )
+
+
+def season_summary(season, df_weekly_winner, df_manager_stats, df_cup, finished_events):
+    """Achievements of every manager in one season, one row per manager.
+
+    df_manager_stats comes from manager_season_stats (or its SQL twin in
+    league_db). Managers are identified by name, as FPL team IDs change every
+    season.
+    """
+    df_winners = df_weekly_winner.assign(
+        player_name=df_weekly_winner["player_name"].astype(str)
+    )
+    summary = df_manager_stats.assign(
+        player_name=df_manager_stats["player_name"].astype(str)
+    ).set_index("player_name")
+    winnings = df_winners.groupby("player_name").agg(
+        weekly_wins=("event", "size"), weekly_prizes=("prize", "sum")
+    )
+    summary = summary.join(winnings)
+    if not df_cup.empty:
+        summary = summary.join(cup_wins(df_cup, finished_events))
+    summary = summary.reindex(columns=SEASON_SUMMARY_COLUMNS[2:]).fillna(0)
+    summary = summary.astype({column: int for column in summary.columns if column != "weekly_prizes"})
+    summary = summary.rename_axis("player_name").reset_index()
+    summary.insert(0, "season", season)
+    return summary[SEASON_SUMMARY_COLUMNS]
+
+
+def alltime_summary(df_seasons):
+    """Season summaries added up per manager, highest weekly prizes first."""
+    summary = df_seasons.groupby("player_name").agg(
+        seasons=("season", "nunique"),
+        gameweeks=("gameweeks", "sum"),
+        points=("points", "sum"),
+        best_gameweek=("best_gameweek", "max"),
+        top_finishes=("top_finishes", "sum"),
+        weekly_wins=("weekly_wins", "sum"),
+        weekly_prizes=("weekly_prizes", "sum"),
+        cup_match_wins=("cup_match_wins", "sum"),
+        cup_titles=("cup_titles", "sum"),
+    )
+    return summary.sort_values(
+        ["weekly_prizes", "points"], ascending=False, kind="stable"
+    ).reset_index()
+
+
+def score_tables(df_completed, df_weekly_scores, df_chips, chip_periods=CHIP_PERIODS):
+    """The weekly winner and chip tables, keyed by table name.
+
+    chip_periods are the gameweek ranges of the chip summary's columns.
+
+    Only each finished gameweek's top scores are needed from df_completed and
+    each manager's player_name and total_points from df_weekly_scores, so both
+    can be queried from the league database (see league_db.top_scores and
+    league_db.manager_points) instead of holding the whole season.
+    """
+    df_weekly_winner = weekly_winners(df_completed)
+    df_chips = chip_display_names(df_chips) if not df_chips.empty else df_chips
+    return {
+        "weekly_winners": df_weekly_winner,
+        "weekly_prizes": weekly_prize_totals(df_weekly_winner),
+        "chip_summary": chip_summary(df_chips, df_weekly_scores, chip_periods),
+        "chip_timeline": chip_timeline(df_chips),
+    }
+
+
+def build_league_tables(
+    df_weekly_scores, df_chips, df_cup, finished_events, chip_periods=CHIP_PERIODS
+):
+    """Build every derived table from the raw ones, keyed by table name.
+
+    Tables whose source is empty (e.g. the weekly scores of a cup-only league)
+    are left out; the chip tables are built, empty, for a league without chips.
+    """
+    tables = {}
+    if not df_weekly_scores.empty:
+        df_completed = completed_scores(df_weekly_scores, finished_events)
+        tables.update(score_tables(df_completed, df_weekly_scores, df_chips, chip_periods))
+        tables["event_ranks"] = event_ranks(df_completed)
+    if not df_cup.empty:
+        tables["cup_matches"] = cup_display_table(df_cup)
+    return tables
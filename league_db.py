@@ -0,0 +1,205 @@
+"""Indexed SQLite copy of the league data for the per-manager queries of the pages.
+
+league.db is derived from the weekly scores table and not committed with it
+(see .gitignore): the ingest builds it, and data_loader rebuilds it from the
+Parquet tables wherever it is missing or older than them.
+"""
+
+import os
+import sqlite3
+
+import pandas as pd
+
+from data_store import iter_table_batches
+
+DB_NAME = "league.db"
+SCORE_COLUMNS = ["entry_id", "player_name", "team_name", "event", "points", "total_points"]
+
+SCHEMA = """
+CREATE TABLE managers (
+    entry_id INTEGER PRIMARY KEY,
+    player_name TEXT NOT NULL,
+    team_name TEXT
+);
+CREATE INDEX managers_player_name ON managers (player_name);
+CREATE TABLE weekly_scores (
+    entry_id INTEGER NOT NULL,
+    event INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    total_points INTEGER,
+    PRIMARY KEY (entry_id, event)
+) WITHOUT ROWID;
+CREATE INDEX weekly_scores_event_points ON weekly_scores (event, points);
+CREATE TABLE finished_events (event INTEGER PRIMARY KEY);
+"""
+
+
+def db_path(data_dir):
+    return os.path.join(data_dir, DB_NAME)
+
+
+def weekly_score_batches(data_dir):
+    """data_dir's weekly scores one record batch at a time, as build_database takes them."""
+    for batch in iter_table_batches("weekly_scores", data_dir, columns=SCORE_COLUMNS):
+        yield batch.to_pandas()
+
+
+def build_database(weekly_score_batches, finished_events, data_dir):
+    """Write data_dir/league.db from the weekly scores, replacing it atomically.
+
+    weekly_score_batches is an iterable of weekly scores DataFrames, e.g. [df]
+    or one per record batch of the table, so the scores never need to be in
+    memory at once. finished_events of None means the status is unknown, and
+    every gameweek counts as finished, as in league_analytics.completed_scores.
+    Returns the number of weekly score rows written.
+    """
+    path = db_path(data_dir)
+    if os.path.exists(f"{path}.tmp"):
+        os.remove(f"{path}.tmp")
+    conn = sqlite3.connect(f"{path}.tmp")
+    conn.executescript(SCHEMA)
+
+    rows = 0
+    for df_weekly_scores in weekly_score_batches:
+        # A manager's latest name wins
+        df_managers = df_weekly_scores.drop_duplicates("entry_id", keep="last")
+        conn.executemany(
+            "INSERT OR REPLACE INTO managers VALUES (?, ?, ?)",
+            zip(
+                df_managers["entry_id"].astype(int),
+                df_managers["player_name"].astype(str),
+                df_managers["team_name"].astype(str),
+            ),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO weekly_scores VALUES (?, ?, ?, ?)",
+            zip(
+                df_weekly_scores["entry_id"].astype(int),
+                df_weekly_scores["event"].astype(int),
+                df_weekly_scores["points"].astype(int),
+                df_weekly_scores["total_points"].astype(int),
+            ),
+        )
+        rows += len(df_weekly_scores)
+    if finished_events is None:
+        conn.execute("INSERT INTO finished_events SELECT DISTINCT event FROM weekly_scores")
+    else:
+        conn.executemany(
+            "INSERT INTO finished_events VALUES (?)", ((int(event),) for event in finished_events)
+        )
+    conn.commit()
+    conn.close()
+    os.replace(f"{path}.tmp", path)
+    return rows
+
+
+def connect(path):
+    """Open a league database read-only."""
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def managers(conn):
+    """Every manager's entry_id, player_name and team_name."""
+    return pd.read_sql_query(
+        "SELECT entry_id, player_name, team_name FROM managers ORDER BY entry_id", conn
+    )
+
+
+def manager_names(conn):
+    rows = conn.execute("SELECT DISTINCT player_name FROM managers ORDER BY player_name")
+    return [name for (name,) in rows]
+
+
+def top_finishes(conn, player_name, top_n=5):
+    """Same result as league_analytics.top_finishes, computed in SQL.
+
+    The manager's gameweeks come from the (entry_id, event) key and each rank
+    is counted from the (event, points) index, so only the rows shown are read.
+    """
+    my_weeks = pd.read_sql_query(
+        """
+        SELECT event, rank, points FROM (
+            SELECT s.event, s.points, 1 + (
+                SELECT COUNT(*) FROM weekly_scores o
+                WHERE o.event = s.event AND o.points > s.points
+            ) AS rank
+            FROM managers m JOIN weekly_scores s ON s.entry_id = m.entry_id
+            WHERE m.player_name = ? AND s.event IN (SELECT event FROM finished_events)
+        )
+        WHERE rank <= ?
+        ORDER BY event
+        """,
+        conn,
+        params=(player_name, top_n),
+    )
+    if my_weeks.empty:
+        return my_weeks, pd.DataFrame(columns=["event", "player_name", "points", "rank"])
+
+    events = my_weeks["event"].unique().tolist()
+    top_groups = pd.read_sql_query(
+        f"""
+        SELECT event, player_name, points, rank FROM (
+            SELECT s.event, m.player_name, s.points,
+                RANK() OVER (PARTITION BY s.event ORDER BY s.points DESC) AS rank
+            FROM weekly_scores s JOIN managers m ON m.entry_id = s.entry_id
+            WHERE s.event IN ({", ".join("?" * len(events))})
+        )
+        WHERE rank <= ?
+        ORDER BY event, points DESC, player_name
+        """,
+        conn,
+        params=(*events, top_n),
+    )
+    return my_weeks, top_groups
+
+
+def top_scores(conn):
+    """Rows of every finished gameweek's top score, for league_analytics.weekly_winners."""
+    return pd.read_sql_query(
+        """
+        SELECT s.event, m.player_name, s.points
+        FROM (
+            SELECT event, MAX(points) AS points FROM weekly_scores
+            WHERE event IN (SELECT event FROM finished_events)
+            GROUP BY event
+        ) top
+        JOIN weekly_scores s ON s.event = top.event AND s.points = top.points
+        JOIN managers m ON m.entry_id = s.entry_id
+        ORDER BY s.event, s.entry_id
+        """,
+        conn,
+    )
+
+
+def manager_points(conn):
+    """Every manager's name and total points, for league_analytics.chip_summary."""
+    return pd.read_sql_query(
+        """
+        SELECT m.player_name, MAX(s.total_points) AS total_points
+        FROM managers m JOIN weekly_scores s ON s.entry_id = m.entry_id
+        GROUP BY m.entry_id
+        ORDER BY m.entry_id
+        """,
+        conn,
+    )
+
+
+def manager_season_stats(conn, top_n=5):
+    """Same result as league_analytics.manager_season_stats, computed in SQL."""
+    return pd.read_sql_query(
+        """
+        SELECT m.player_name, COUNT(*) AS gameweeks, SUM(r.points) AS points,
+            MAX(r.points) AS best_gameweek, SUM(r.rank <= ?) AS top_finishes
+        FROM (
+            SELECT entry_id, points,
+                RANK() OVER (PARTITION BY event ORDER BY points DESC) AS rank
+            FROM weekly_scores
+            WHERE event IN (SELECT event FROM finished_events)
+        ) r
+        JOIN managers m ON m.entry_id = r.entry_id
+        GROUP BY m.player_name
+        ORDER BY m.player_name
+        """,
+        conn,
+        params=(top_n,),
+    )
@@ -0,0 +1,92 @@
+"""Provisional scores of the current gameweek from live player points and picks."""
+
+import numpy as np
+import pandas as pd
+
+STARTERS = 11  # Squad positions 1-11 start, 12-15 are the bench
+
+
+def picks_table(picks_by_entry, event):
+    """One row per manager and squad position from /entry/{id}/event/{gw}/picks/ payloads.
+
+    Managers whose picks are missing (None) are left out.
+    """
+    rows = []
+    for entry_id, data in picks_by_entry.items():
+        if not data:
+            continue
+        transfers_cost = (data.get("entry_history") or {}).get("event_transfers_cost", 0)
+        for pick in data["picks"]:
+            rows.append(
+                {
+                    "entry_id": entry_id,
+                    "event": event,
+                    "position": pick["position"],
+                    "element": pick["element"],
+                    "multiplier": pick["multiplier"],
+                    "is_captain": pick["is_captain"],
+                    "active_chip": data.get("active_chip") or "",
+                    "event_transfers_cost": transfers_cost,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def live_element_points(live):
+    """Live points of every player, indexed by element id, from /event/{gw}/live/."""
+    elements = live.get("elements", [])
+    ids = np.array([element["id"] for element in elements], dtype=np.int64)
+    points = np.zeros(ids.max() + 1 if len(ids) else 1, dtype=np.int64)
+    points[ids] = [element["stats"]["total_points"] for element in elements]
+    return points
+
+
+def live_scores(df_picks, element_points):
+    """Provisional points of every manager in df_picks.
+
+    Picks are laid out as managers x squad positions matrices of element ids
+    and multipliers, so every manager is scored at once by looking the elements
+    up in element_points (see live_element_points). The pick multipliers carry
+    captaincy and chips (2 or 3 for the captain, 1 on the bench with a Bench
+    Boost); automatic substitutions are not applied until the gameweek ends.
+    """
+    columns = [
+        "entry_id",
+        "event",
+        "points",
+        "points_on_bench",
+        "event_transfers_cost",
+        "net_points",
+        "active_chip",
+    ]
+    if df_picks.empty:
+        return pd.DataFrame(columns=columns)
+
+    squads = df_picks.pivot(index="entry_id", columns="position", values=["element", "multiplier"])
+    elements = squads["element"].fillna(0).to_numpy(dtype=np.int64)
+    multipliers = squads["multiplier"].fillna(0).to_numpy(dtype=np.int64)
+    # Players missing from the live data (e.g. new signings) score nothing
+    elements[elements >= len(element_points)] = 0
+    points = element_points[elements]
+
+    per_entry = df_picks.groupby("entry_id")[["event", "event_transfers_cost", "active_chip"]].first()
+    df_live = per_entry.reset_index()
+    df_live["points"] = (points * multipliers).sum(axis=1)
+    df_live["points_on_bench"] = points[:, STARTERS:].sum(axis=1)
+    df_live["net_points"] = df_live["points"] - df_live["event_transfers_cost"]
+    return df_live[columns]
+
+
+def live_leaderboard(df_live, league_entries):
+    """Live scores of a league's managers, highest first, with their names and rank."""
+    df_entries = pd.DataFrame(
+        {
+            "entry_id": [entry["entry"] for entry in league_entries],
+            "player_name": [entry.get("player_name", "Unknown Player") for entry in league_entries],
+            "team_name": [entry.get("entry_name", "Unknown Team") for entry in league_entries],
+        }
+    )
+    df_board = df_entries.merge(df_live, on="entry_id")
+    df_board["player_name"] = df_board["player_name"].str.title()
+    df_board["rank"] = df_board["net_points"].rank(method="min", ascending=False).astype(int)
+    return df_board.sort_values(["rank", "player_name"], kind="stable").reset_index(drop=True)
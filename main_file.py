@@ -2,43 +2,36 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import altair as alt
-import time
-import threading
 from streamlit_javascript import st_javascript
+from data_loader import load_manager_names, load_season, pin_data_version
+from refresh_worker import ENABLED as BACKGROUND_REFRESH, RefreshWorker
 from streamlit_pages.prizes import show_prizes_page
 from streamlit_pages.jager_cup import run_cup_page
 from streamlit_pages.weekly_winnings import show_weekly_winner_page
 from streamlit_pages.chip_usage import show_chip_usage_page
+from streamlit_pages.diagnostics import show_diagnostics_page
+from streamlit_pages.all_time import show_all_time_page
 
 
-def keep_alive():
-    """Background thread to keep the app active"""
-    while True:
-        time.sleep(300)
-
-
-def load_weekly_scores():
-    @st.cache_data(ttl=60)
-    def load_data():
-        return pd.read_csv("data/weekly_scores.csv")
-
-    return load_data()
+@st.cache_resource(show_spinner=False)
+def start_refresh_worker():
+    """Start the background data refresh once per server process, for all sessions"""
+    return RefreshWorker().start()
 
 
 def initialize_session_state():
     if "selected_user" not in st.session_state:
         st.session_state.selected_user = "Dan Coulton"
 
-    if "keep_alive_started" not in st.session_state:
-        st.session_state.keep_alive_started = True
-        thread = threading.Thread(target=keep_alive, daemon=True)
-        thread.start()
+    if BACKGROUND_REFRESH:
+        start_refresh_worker()
 
 
-def render_sidebar(df_weekly_scores):
+def render_sidebar():
     """Render sidebar with persistent dropdown"""
-    st.sidebar.title("The Jager Crew ⚽ 2025/26")
-    user_options = sorted(set(df_weekly_scores["player_name"]))
+    season = load_season() or "2025-26"
+    st.sidebar.title(f"The Jager Crew ⚽ {season.replace('-', '/')}")
+    user_options = load_manager_names()
     selected_user = st.sidebar.selectbox(
         label="Select your name",
         options=user_options,
@@ -62,15 +55,16 @@ def main():
     if width is not None:
         st.session_state["is_mobile"] = width < 700
 
-    df_weekly_scores = load_weekly_scores()
+    # Every table of this run comes from the same data snapshot
+    pin_data_version()
 
     initialize_session_state()
-    selected_user = render_sidebar(df_weekly_scores)
+    selected_user = render_sidebar()
 
     pages = [
         st.Page(show_prizes_page, title="Prize Fund", icon="💵"),
         st.Page(
-            lambda: show_weekly_winner_page(df_weekly_scores, selected_user),
+            lambda: show_weekly_winner_page(selected_user),
             title="Weekly Winner",
             icon="📅",
             url_path="/weekly-winner",
@@ -82,8 +76,27 @@ def main():
             url_path="/chip-usage",
         ),
         st.Page(run_cup_page, title="Jager Cup (from GW34)", icon="🏆"),
+        st.Page(
+            lambda: show_all_time_page(selected_user),
+            title="All Time",
+            icon="🏛️",
+            url_path="/all-time",
+        ),
     ]
 
+    # Hidden diagnostics page, opened with ?diagnostics=1
+    if st.query_params.get("diagnostics"):
+        st.session_state["show_diagnostics"] = True
+    if st.session_state.get("show_diagnostics"):
+        pages.append(
+            st.Page(
+                show_diagnostics_page,
+                title="Diagnostics",
+                icon="🩺",
+                url_path="/diagnostics",
+            )
+        )
+
     pg = st.navigation(pages, position="top")
 
     pg.run()
@@ -0,0 +1,149 @@
+"""Background data refresh for the Streamlit server process."""
+
+import json
+import os
+import threading
+import time
+import traceback
+
+import pandas as pd
+
+import initial_setup
+from archive import archive_dir
+from data_store import (
+    DATA_DIR,
+    data_time,
+    ingest_in_progress,
+    parse_finished_events,
+    read_table,
+    refresh_dir,
+    replace_files,
+    table_files,
+)
+from fpl_cache import CURRENT_EVENT_TTL, LIVE_TTL
+from instrumentation import RUN_REPORT_NAME
+
+ENABLED = os.environ.get("FPL_BACKGROUND_REFRESH", "1") == "1"
+# Seconds between live refreshes (live points and picks only) while a gameweek
+# is in progress; never below the live points' TTL, so each gets fresh points
+LIVE_INTERVAL = max(LIVE_TTL, int(os.environ.get("FPL_REFRESH_LIVE_SECONDS", 5 * 60)))
+# Seconds between full refreshes while a gameweek is in progress, by default
+# the TTL of its standings and histories, and otherwise
+LIVE_FULL_INTERVAL = int(os.environ.get("FPL_REFRESH_LIVE_FULL_SECONDS", CURRENT_EVENT_TTL))
+IDLE_INTERVAL = int(os.environ.get("FPL_REFRESH_IDLE_SECONDS", 6 * 60 * 60))
+
+
+class RefreshWorker:
+    """Daemon thread running initial_setup's ingest on a schedule.
+
+    The ingest writes to data_dir's refresh directory (data/.refresh/, not
+    tracked by git), seeded from data_dir whenever the tables there are newer,
+    e.g. after a git pull of the scheduled workflow's data. Each refresh is
+    published as a snapshot there, which sessions switch to on their next rerun
+    (see data_store.latest_data_dir).
+
+    While the current gameweek is unfinished, live refreshes (live points and
+    picks only) run every live_interval seconds and full ones every
+    live_full_interval; otherwise full refreshes run every idle_interval. The
+    schedule starts from the last run report, so a restarted server doesn't
+    refetch fresh data.
+    """
+
+    def __init__(
+        self,
+        data_dir=DATA_DIR,
+        live_interval=LIVE_INTERVAL,
+        live_full_interval=LIVE_FULL_INTERVAL,
+        idle_interval=IDLE_INTERVAL,
+    ):
+        self.data_dir = data_dir
+        self.work_dir = refresh_dir(data_dir)
+        self.live_interval = live_interval
+        self.live_full_interval = live_full_interval
+        self.idle_interval = idle_interval
+        self.last_report = self.read_report()
+        self._last_run_at = self.last_report["finished_at"] if self.last_report else None
+        self._last_full_at = (
+            self._last_run_at if self.last_report and not self.last_report.get("live_only") else None
+        )
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self.run, name="fpl-refresh", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def read_report(self):
+        """The run report of the last refresh into work_dir, or None if it never ran."""
+        try:
+            with open(os.path.join(self.work_dir, RUN_REPORT_NAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_live(self):
+        """Whether the saved gameweek info has a current gameweek still in progress."""
+        try:
+            gw_info = read_table("gameweek_info", self.work_dir)
+        except FileNotFoundError:
+            return False
+        if gw_info.empty or pd.isna(gw_info["current_event"].iloc[0]):
+            return False
+        finished_events = parse_finished_events(gw_info["finished_events"].iloc[0])
+        return int(gw_info["current_event"].iloc[0]) not in finished_events
+
+    def next_refresh(self):
+        """(seconds until the next refresh is due, whether it is a live-only one)."""
+        if self._last_full_at is None:
+            return 0, False
+        now = time.time()
+        if not self.is_live():
+            return max(0, self._last_full_at + self.idle_interval - now), False
+        full_due = self._last_full_at + self.live_full_interval
+        live_due = self._last_run_at + self.live_interval
+        if live_due < full_due:
+            return max(0, live_due - now), True
+        return max(0, full_due - now), False
+
+    def seed(self):
+        """Copy data_dir's tables and archive into work_dir if they are newer than its own.
+
+        Not while an ingest is writing to data_dir, whose tables may be half-written.
+        """
+        if ingest_in_progress(self.data_dir):
+            return False
+        source_time = data_time(self.data_dir)
+        work_time = data_time(self.work_dir)
+        if source_time is None or (work_time is not None and work_time >= source_time):
+            return False
+        replace_files(table_files(self.data_dir), self.data_dir, self.work_dir)
+        archive = archive_dir(self.data_dir)
+        for root, _, files in os.walk(archive):
+            target = os.path.join(archive_dir(self.work_dir), os.path.relpath(root, archive))
+            replace_files(files, root, target)
+        print(f"Seeded {self.work_dir} from the newer tables in {self.data_dir}")
+        return True
+
+    def request_refresh(self):
+        """Run a full refresh now instead of waiting for the next scheduled one."""
+        self._wake.set()
+
+    def run(self):
+        while True:
+            delay, live_only = self.next_refresh()
+            if self._wake.wait(delay):
+                live_only = False
+            self._wake.clear()
+            print(f"Background {'live' if live_only else 'full'} refresh of {self.work_dir} started")
+            try:
+                # Newer tables from data_dir need a full refresh to build on them
+                if self.seed():
+                    live_only = False
+                self.last_report = initial_setup.run_ingest(
+                    data_dir=self.work_dir, live_only=live_only
+                )
+            except Exception:
+                traceback.print_exc()
+            self._last_run_at = time.time()
+            if not live_only:
+                self._last_full_at = self._last_run_at
@@ -0,0 +1,76 @@
+import streamlit as st
+from data_loader import load_alltime_table
+from instrumentation import timed
+from streamlit_pages.sections import show_lazy_sections
+from streamlit_pages.weekly_winnings import highlight_user
+
+# Display names of the season summary columns
+SUMMARY_COLUMNS = {
+    "player_name": st.column_config.TextColumn("Manager", width=150),
+    "seasons": st.column_config.NumberColumn("Seasons", width=70),
+    "season": st.column_config.TextColumn("Season", width=80),
+    "weekly_prizes": st.column_config.NumberColumn("Winnings", format="£ %.2f", width=90),
+    "weekly_wins": st.column_config.NumberColumn("Weekly Wins", width=90),
+    "top_finishes": st.column_config.NumberColumn("Top 5 Finishes", width=110),
+    "cup_titles": st.column_config.NumberColumn("Cup Titles", width=80),
+    "cup_match_wins": st.column_config.NumberColumn("Cup Wins", width=80),
+    "points": st.column_config.NumberColumn("Points", width=80),
+    "best_gameweek": st.column_config.NumberColumn("Best GW", width=70),
+    "gameweeks": st.column_config.NumberColumn("Gameweeks", width=90),
+}
+
+
+def show_all_time_page(selected_user):
+    """Display the all-time leaderboards across every archived season"""
+    st.title("All Time")
+
+    with timed("page/all_time/load"):
+        df_managers = load_alltime_table("alltime_managers")
+
+    if df_managers.empty:
+        st.info("No seasons archived yet. They are archived by initial_setup.py.")
+        return
+
+    show_lazy_sections(
+        {
+            "🏛️ All-Time Leaderboard": lambda: show_alltime_leaderboard(df_managers, selected_user),
+            "📆 By Season": lambda: show_seasons(selected_user),
+        },
+        key="all_time_section",
+    )
+
+
+def show_alltime_leaderboard(df_managers, selected_user):
+    with timed("page/all_time/render"):
+        columns = [column for column in SUMMARY_COLUMNS if column in df_managers.columns]
+        st.dataframe(
+            df_managers[columns].style.apply(highlight_user(selected_user), axis=1),
+            hide_index=True,
+            column_config=SUMMARY_COLUMNS,
+            use_container_width=False,
+        )
+
+
+def show_seasons(selected_user):
+    with timed("page/all_time/load"):
+        df_seasons = load_alltime_table("alltime_seasons")
+
+    if df_seasons.empty or "season" not in df_seasons.columns:
+        st.info("No season summaries found. They are rebuilt by archive.py.")
+        return
+
+    seasons = sorted(df_seasons["season"].unique(), reverse=True)
+    season = st.selectbox("Season", seasons, key="all_time_season")
+
+    with timed("page/all_time/render"):
+        df_season = df_seasons[df_seasons["season"] == season].sort_values(
+            ["weekly_prizes", "points"], ascending=False, kind="stable"
+        )
+        columns = [column for column in SUMMARY_COLUMNS if column in df_season.columns]
+        columns.remove("season")
+        st.dataframe(
+            df_season[columns].style.apply(highlight_user(selected_user), axis=1),
+            hide_index=True,
+            column_config=SUMMARY_COLUMNS,
+            use_container_width=False,
+        )
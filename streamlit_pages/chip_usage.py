@@ -1,76 +1,44 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
-
-
-def load_chip_usage():
-    """Load chip usage data with caching"""
-
-    @st.cache_data(ttl=60)
-    def load_data():
-        try:
-            return pd.read_csv("data/chip_usage.csv")
-        except FileNotFoundError:
-            st.error("Chip usage data not found. Please run initial_setup.py first.")
-            return pd.DataFrame()
-
-    return load_data()
-
-
-def load_weekly_scores():
-    """Load weekly scores data with caching"""
-
-    @st.cache_data(ttl=60)
-    def load_data():
-        try:
-            return pd.read_csv("data/weekly_scores.csv")
-        except FileNotFoundError:
-            st.error("Weekly scores data not found. Please run initial_setup.py first.")
-            return pd.DataFrame()
-
-    return load_data()
+import data_loader
+from instrumentation import timed
+from streamlit_pages.sections import show_lazy_sections
 
 
 def show_chip_usage_page(selected_user):
     """Display the chip usage page content"""
     st.title("Chip Usage Analysis")
 
-    df_chips = load_chip_usage()
-    df_weekly_scores = load_weekly_scores()
+    # The summary has every manager and the timeline every chip played, so
+    # they tell whether there are scores and chips without loading the raw tables
+    with timed("page/chip_usage/load"):
+        no_scores = data_loader.load_league_table("chip_summary").empty
+        no_chips = data_loader.load_league_table("chip_timeline").empty
 
-    if df_weekly_scores.empty:
+    if no_scores:
         st.error("Weekly scores data not found. Please run initial_setup.py first.")
         return
 
     # If no chip data exists, we'll still show all managers with empty chip usage
-    if df_chips.empty:
+    if no_chips:
         st.info("No chip usage data available yet. Showing all managers with no chips used.")
-    else:
-        # Create chip display mapping
-        chip_mapping = {
-            "bboost": "🚀 Bench Boost",
-            "freehit": "🎯 Free Hit",
-            "3xc": "👑 Triple Captain",
-            "wildcard": "🔄 Wildcard",
-        }
-
-        # Map chip names for display
-        df_chips["chip_display"] = df_chips["chip"].map(chip_mapping)
-        df_chips["chip_display"] = df_chips["chip_display"].fillna(df_chips["chip"])
 
-        # Filter out "manager" chip as it's not a real FPL chip
-        df_chips = df_chips[df_chips["chip"] != "manager"]
+    # Only the selected section is loaded and rendered
+    show_lazy_sections(
+        {
+            "🎯 Chip Summary": lambda: show_chip_summary(selected_user),
+            "📈 Chip Timeline": show_chip_timeline,
+        },
+        key="chip_usage_section",
+    )
 
-    # Styling function
-    def highlight_row(row):
-        if row["player_name"] == selected_user:
-            return ["background-color: #cce5ff"] * len(row)  # light blue
-        else:
-            return [""] * len(row)
 
-    tab1, tab2 = st.tabs(["🎯 Chip Summary", "📈 Chip Timeline"])
+def show_chip_summary(selected_user):
+    # Ranked by total points with chips per half-season, precomputed at ingest
+    with timed("page/chip_usage/load"):
+        chip_summary = data_loader.load_league_table("chip_summary")
 
-    with tab1:
+    with timed("page/chip_usage/render"):
         st.subheader("Chip Usage Summary by Manager")
 
         # Add legend for chip emojis
@@ -82,110 +50,17 @@ def show_chip_usage_page(selected_user):
         )
         st.markdown("---")
 
-        # Get all managers from weekly scores data
-        all_managers = df_weekly_scores["player_name"].unique() if not df_weekly_scores.empty else []
-        
-        # If we have chip data, count chips used by each player
-        if not df_chips.empty:
-            chip_counts = (
-                df_chips.groupby(["player_name", "chip_display"])
-                .size()
-                .unstack(fill_value=0)
-            )
-            chip_summary = chip_counts.reset_index()
-        else:
-            # If no chip data, create empty DataFrame with all managers
-            chip_summary = pd.DataFrame({"player_name": all_managers})
-        
-        # Ensure all managers are included, even if they haven't used chips
-        all_managers_df = pd.DataFrame({"player_name": all_managers})
-        chip_summary = all_managers_df.merge(chip_summary, on="player_name", how="left")
-        
-        # Fill NaN values with 0 for chip columns
-        chip_columns = [col for col in chip_summary.columns if col != "player_name"]
-        for col in chip_columns:
-            if col in chip_summary.columns:
-                chip_summary[col] = chip_summary[col].fillna(0)
-
-        chip_summary = chip_summary.rename(columns={"player_name": "Manager"})
-
-        # Add total points column
-        if not df_weekly_scores.empty:
-            total_points = (
-                df_weekly_scores.groupby("player_name")["total_points"]
-                .max()
-                .reset_index()
-            )
-            total_points = total_points.rename(columns={"player_name": "Manager"})
-            chip_summary = chip_summary.merge(total_points, on="Manager", how="left")
-            chip_summary["total_points"] = (
-                chip_summary["total_points"].fillna(0).astype(int)
-            )
-        else:
-            chip_summary["total_points"] = 0
-
-        # Create function to format chips for a specific gameweek range
-        def format_chips_for_period(manager, gw_start, gw_end):
-            # Return empty string if no chip data available
-            if df_chips.empty:
-                return ""
-                
-            # Filter chips for this manager and gameweek range
-            manager_chips = df_chips[
-                (df_chips["player_name"] == manager)
-                & (df_chips["event"] >= gw_start)
-                & (df_chips["event"] <= gw_end)
-            ]
-
-            if manager_chips.empty:
-                return ""
-
-            # Count chips by type for this period
-            chip_counts_period = manager_chips.groupby("chip_display").size()
-            chips_used = []
-
-            # Define the desired order of chips
-            chip_order = [
-                ("🚀 Bench Boost", "🚀"),
-                ("🎯 Free Hit", "🎯"),
-                ("👑 Triple Captain", "👑"),
-                ("🔄 Wildcard", "🔄"),
-            ]
-
-            # Process chips in the specified order
-            for chip_name, emoji in chip_order:
-                if chip_name in chip_counts_period:
-                    count = chip_counts_period[chip_name]
-                    if count > 0:
-                        chips_used.append(emoji * count)
-
-            return " ".join(chips_used) if chips_used else ""
-
-        # Create chips columns for each period
-        chip_summary["Chips GW 1-19"] = chip_summary["Manager"].apply(
-            lambda x: format_chips_for_period(x, 1, 19)
-        )
-        chip_summary["Chips GW 20-38"] = chip_summary["Manager"].apply(
-            lambda x: format_chips_for_period(x, 20, 38)
-        )
-
-        # Sort by total points (descending) and add rank
-        chip_summary = chip_summary.sort_values("total_points", ascending=False)
-        chip_summary["Rank"] = range(1, len(chip_summary) + 1)
-
-        # Keep only the columns we want to display
-        chip_summary = chip_summary[
-            ["Rank", "Manager", "total_points", "Chips GW 1-19", "Chips GW 20-38"]
-        ]
-
-        # Create column configuration
+        # Create column configuration, with one chips column per season period
         config_columns = {
             "Rank": st.column_config.NumberColumn("Rank", width=50),
             "Manager": st.column_config.TextColumn("Manager", width=120),
             "total_points": st.column_config.NumberColumn("Total Points", width=90),
-            "Chips GW 1-19": st.column_config.TextColumn("GW 1-19", width=110),
-            "Chips GW 20-38": st.column_config.TextColumn("GW 20-38", width=110),
         }
+        for column in chip_summary.columns:
+            if column.startswith("Chips "):
+                config_columns[column] = st.column_config.TextColumn(
+                    column.removeprefix("Chips "), width=110
+                )
 
         # Create styling function for summary
         def highlight_summary_row(row):
@@ -203,20 +78,18 @@ def show_chip_usage_page(selected_user):
             + 3,  # Calculate height to show all rows
         )
 
-    with tab2:
+
+def show_chip_timeline():
+    # Chips used per gameweek, precomputed at ingest
+    with timed("page/chip_usage/load"):
+        timeline_data = data_loader.load_league_table("chip_timeline")
+
+    with timed("page/chip_usage/render"):
         st.subheader("Chip Usage Timeline")
 
         # Create a timeline chart
-        if not df_chips.empty:
-            # Count chips used per gameweek
-            timeline_data = (
-                df_chips.groupby(["event", "chip_display"])
-                .size()
-                .reset_index(name="count")
-            )
-
-            # Ensure count is integer type and convert to string for labels
-            timeline_data['count'] = timeline_data['count'].astype(int)
+        if not timeline_data.empty:
+            # Convert count to string for labels
             timeline_data['count_str'] = timeline_data['count'].astype(str)
 
             chart = (
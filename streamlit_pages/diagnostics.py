@@ -0,0 +1,85 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from data_loader import load_run_report
+from instrumentation import stage_stats
+
+
+def stage_table(stages, prefix):
+    """One row per stage with its call count and timings in milliseconds."""
+    rows = [
+        {
+            "Stage": stage.removeprefix(prefix),
+            "Calls": stats["count"],
+            "Mean (ms)": round(stats["total_seconds"] * 1000 / stats["count"], 1),
+            "Max (ms)": round(stats["max_seconds"] * 1000, 1),
+            "Last (ms)": round(stats["last_seconds"] * 1000, 1),
+        }
+        for stage, stats in sorted(stages.items())
+    ]
+    return pd.DataFrame(rows)
+
+
+def show_ingest_report(report):
+    st.subheader("Last Data Refresh")
+    finished_at = datetime.fromtimestamp(report["finished_at"]).strftime("%Y-%m-%d %H:%M")
+    endpoints = report["endpoints"]
+    total_requests = sum(stats["requests"] for stats in endpoints.values())
+    cache_hits = sum(
+        stats["cache"]["HIT"] + stats["cache"]["REVALIDATED"] for stats in endpoints.values()
+    )
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Finished", finished_at)
+    col2.metric("Duration", f"{report['duration_seconds']:.1f} s")
+    col3.metric("Requests", total_requests)
+    col4.metric("Cache hit rate", f"{cache_hits / total_requests:.0%}" if total_requests else "-")
+    if report["error"]:
+        st.error(f"The refresh stopped early: {report['error']}")
+
+    if endpoints:
+        df_endpoints = pd.DataFrame(
+            [
+                {
+                    "Endpoint": name,
+                    "Requests": stats["requests"],
+                    "Errors": stats["errors"],
+                    "KB": round(stats["bytes"] / 1024, 1),
+                    "Mean (ms)": stats["mean_ms"],
+                    "Cache hit rate": stats["cache_hit_rate"],
+                }
+                for name, stats in endpoints.items()
+            ]
+        )
+        st.dataframe(df_endpoints, hide_index=True, use_container_width=False)
+
+        st.markdown("**Request latency (ms)**")
+        df_latency = pd.DataFrame(
+            {name: stats["latency_ms"] for name, stats in endpoints.items()}
+        ).T
+        st.dataframe(df_latency, use_container_width=False)
+
+    st.markdown("**Ingest stages**")
+    st.dataframe(
+        stage_table(report["stages"], "ingest/"), hide_index=True, use_container_width=False
+    )
+
+
+def show_diagnostics_page():
+    """Display the last run report and the page timings of this app process"""
+    st.title("Diagnostics")
+
+    report = load_run_report()
+    if report is None:
+        st.info("No run report yet. It is written by initial_setup.py.")
+    else:
+        show_ingest_report(report)
+
+    st.subheader("Page Timings")
+    page_stages = stage_stats("page/")
+    if page_stages:
+        st.dataframe(
+            stage_table(page_stages, "page/"), hide_index=True, use_container_width=False
+        )
+    else:
+        st.info("No pages have been rendered by this app process yet.")
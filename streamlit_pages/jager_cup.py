@@ -1,144 +1,123 @@
+import html
 import streamlit as st
-import pandas as pd
-import os
+from data_loader import load_cup_view_model
+from instrumentation import timed
 
 
-@st.cache_data(ttl=60)
 def load_jager_cup_data():
-    """Load Jager Cup matches data with caching"""
-    csv_path = "data/jager_cup_matches.csv"
-    if os.path.exists(csv_path):
-        try:
-            return pd.read_csv(csv_path)
-        except Exception as e:
-            return None
-    return None
+    """Load the Jager Cup view model (matches and byes per stage) from the shared cache"""
+    try:
+        view_model = load_cup_view_model()
+    except Exception as e:
+        return None
+    return view_model or None
 
 
 def run_cup_page():
     st.title("Jager Cup 🏆")
 
     # Try to load data from CSV file
-    df = load_jager_cup_data()
-    if df is not None:
-        display_cup_matches_by_week(df)
+    with timed("page/jager_cup/load"):
+        view_model = load_jager_cup_data()
+    if view_model is not None:
+        with timed("page/jager_cup/render"):
+            display_cup_matches_by_week(view_model)
     else:
         st.warning("Jager Cup matches will begin in GW34.")
 
 
-def display_cup_matches_by_week(df):
-    if df.empty:
-        st.warning("Jager Cup matches will begin in GW34.")
-        return
+# Styles for the stage blocks: two columns of match cards and a column of
+# byes, stacked on narrow screens like st.columns
+CUP_CSS = """
+<style>
+.cup-stage {display: flex; flex-wrap: wrap; gap: 1rem;}
+.cup-col {flex: 1 1 0; min-width: 0;}
+.cup-card {height: 100px; box-sizing: border-box; overflow: auto; padding: 1rem;
+    margin-bottom: 1rem; border: 1px solid rgba(49, 51, 63, 0.2); border-radius: 0.5rem;}
+.cup-card-cols {display: grid; grid-template-columns: 2fr 1fr 1fr; gap: 1rem;}
+.cup-byes {display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;}
+@media (max-width: 640px) {.cup-col {flex-basis: 100%;}}
+</style>
+"""
+
+
+def match_card_html(match, is_mobile):
+    """One match card, in the mobile or desktop layout"""
+    player_1 = html.escape(str(match["player_1"]))
+    player_2 = html.escape(str(match["player_2"]))
+    if is_mobile:
+        content = (
+            f"<div style='margin-bottom: 0.6em; line-height: 2; font-size: 1em; position: relative; top: -10px;'>"
+            f"<span style='position: absolute; left: 0%;'><b>{player_1}</b></span>"
+            f"<span style='position: absolute; left: 50%;'>{match['points_1']}</span>"
+            f"<span style='position: absolute; left: 75%;'>{match['mark_1']}</span><br>"
+            f"<span style='position: absolute; left: 0%;'><b>{player_2}</b></span>"
+            f"<span style='position: absolute; left: 50%;'>{match['points_2']}</span>"
+            f"<span style='position: absolute; left: 75%;'>{match['mark_2']}</span>"
+            f"</div>"
+        )
+    else:
+        content = (
+            f"<div class='cup-card-cols'>"
+            f"<div style='margin-bottom: 0.2em; line-height: 2; font-size: 1em;'>"
+            f"<b>{player_1}</b><br>"
+            f"<hr style='margin:2px 0;'>"
+            f"<b>{player_2}</b>"
+            f"</div>"
+            f"<div style='margin-bottom: 0.2em; line-height: 2.3; font-size: 1em; text-align: center;'>"
+            f"{match['points_1']}<br>"
+            f"{match['points_2']}"
+            f"</div>"
+            f"<div style='margin-bottom: 0.2em; line-height: 2.3; font-size: 1em; text-align: center;'>"
+            f"{match['mark_1']}<br>"
+            f"{match['mark_2']}"
+            f"</div>"
+            f"</div>"
+        )
+    return f"<div class='cup-card'>{content}</div>"
 
-    # Convert DataFrame to match the expected format for display
-    matches = []
-    for _, row in df.iterrows():
-        matches.append({
-            "Week": row["event"],
-            "Stage": row["stage"],
-            "Player 1": row["entry_1_player_name"] if pd.notna(row["entry_1_player_name"]) else "",
-            "Team 1": row["entry_1_team_name"],
-            "Points 1": row["entry_1_points"],
-            "Player 2": row["entry_2_player_name"] if pd.notna(row["entry_2_player_name"]) else "",
-            "Team 2": row["entry_2_team_name"],
-            "Points 2": row["entry_2_points"],
-            "Winner": row["winner"],
-            "Is Bye": row["is_bye"],
-        })
-    
-    df_display = pd.DataFrame(matches)
-    if df_display.empty:
+
+def stage_html(stage_view, is_mobile):
+    """A whole stage as one HTML block: matches alternate between two columns,
+    byes are split over two columns inside the third"""
+    cards = [match_card_html(match, is_mobile) for match in stage_view["matches"]]
+    columns = [
+        f"<div class='cup-col'>{''.join(cards[0::2])}</div>",
+        f"<div class='cup-col'>{''.join(cards[1::2])}</div>",
+    ]
+
+    bye_managers = stage_view["byes"]
+    byes = ""
+    if bye_managers:
+        half = (len(bye_managers) + 1) // 2
+        bye_cols = [
+            "".join(
+                f"<div style='margin-bottom: 0.5em; font-size: 1em;'><b>{html.escape(str(manager))}</b></div>"
+                for manager in managers
+            )
+            for managers in (bye_managers[:half], bye_managers[half:])
+        ]
+        byes = (
+            f"<h3>Byes</h3><div class='cup-byes'>"
+            f"<div>{bye_cols[0]}</div><div>{bye_cols[1]}</div></div>"
+        )
+    columns.append(f"<div class='cup-col'>{byes}</div>")
+    return f"<div class='cup-stage'>{''.join(columns)}</div>"
+
+
+def display_cup_matches_by_week(view_model):
+    """Render the cup stages precomputed by league_analytics.cup_view_model"""
+    if not view_model:
         st.warning("Jager Cup matches will begin in GW34.")
         return
 
-    # Sort by stage and week
-    df_display = df_display.sort_values(["Week"]).reset_index(drop=True)
-    # Create a tab for each stage (e.g., "Round of 32", "Quarter Final", etc.)
-    stages = df_display["Stage"].unique().tolist()
-    tabs = st.tabs(stages)
-    for i, stage in enumerate(stages):
-        with tabs[i]:
-            df_gw = df_display[df_display["Stage"] == stage]
-            # Separate byes from regular matches
-            df_matches = df_gw[~df_gw["Is Bye"]]
-            df_byes = df_gw[df_gw["Is Bye"]]
-
-            cols = st.columns(3)
-            week_idx = 0
-            # Detect mobile state
-            is_mobile = st.session_state.get("is_mobile", False)
-
-            # Adjust layout based on mobile state
-            for idx, row in df_matches.iterrows():
-                with cols[week_idx % 2]:
-                    with st.container(height=100):
-                        if is_mobile:
-                            container_cols = st.columns([1])  # Single column for mobile
-                            image = "✅ " if stage != "Final" else "🏆 "
-                            st.markdown(
-                                f"<div style='margin-bottom: 0.6em; line-height: 2; font-size: 1em; position: relative; top: -10px;'>"
-                                f"<span style='position: absolute; left: 0%;'><b>{row['Player 1']}</b></span>"
-                                f"<span style='position: absolute; left: 50%;'>{row['Points 1']}</span>"
-                                f"<span style='position: absolute; left: 75%;'>{image if row['Points 1'] > row['Points 2'] else ''}</span><br>"
-                                f"<span style='position: absolute; left: 0%;'><b>{row['Player 2']}</b></span>"
-                                f"<span style='position: absolute; left: 50%;'>{row['Points 2']}</span>"
-                                f"<span style='position: absolute; left: 75%;'>{image if row['Points 2'] > row['Points 1'] else ''}</span>"
-                                f"</div>",
-                                unsafe_allow_html=True,
-                            )
-                        else:
-                            container_cols = st.columns(
-                                [2, 1, 1]
-                            )  # Original layout for desktop
-
-                            with container_cols[0]:
-                                st.markdown(
-                                    f"<div style='margin-bottom: 0.2em; line-height: 2; font-size: 1em;'>"
-                                    f"<b>{row['Player 1']}</b><br>"
-                                    f"<hr style='margin:2px 0;'>"
-                                    f"<b>{row['Player 2']}</b>"
-                                    f"</div>",
-                                    unsafe_allow_html=True,
-                                )
-                            with container_cols[1]:
-                                st.markdown(
-                                    f"<div style='margin-bottom: 0.2em; line-height: 2.3; font-size: 1em; text-align: center;'>"
-                                    f"{row['Points 1']}<br>"
-                                    f"{row['Points 2']}"
-                                    f"</div>",
-                                    unsafe_allow_html=True,
-                                )
-                            with container_cols[2]:
-                                if row["Points 1"] > row["Points 2"]:
-                                    winner = row["Player 1"]
-                                elif row["Points 2"] > row["Points 1"]:
-                                    winner = row["Player 2"]
-                                else:
-                                    winner = None
-
-                                image = "✅ " if stage != "Final" else "🏆 "
-                                st.markdown(
-                                    f"<div style='margin-bottom: 0.2em; line-height: 2.3; font-size: 1em; text-align: center;'>"
-                                    f"{image if winner == row['Player 1'] else ''}<br>"
-                                    f"{image if winner == row['Player 2'] else ''}"
-                                    f"</div>",
-                                    unsafe_allow_html=True,
-                                )
-                week_idx += 1
-
-            # Display byes at the bottom, split into two columns inside column 3
-            if not df_byes.empty:
-                with cols[2]:
-                    st.subheader("Byes")
-                    bye_managers = df_byes.sort_values("Player 1")["Player 1"].tolist()
-                    half = (len(bye_managers) + 1) // 2
-                    bye_cols = st.columns(2)
-                    for i, manager in enumerate(bye_managers):
-                        with bye_cols[0 if i < half else 1]:
-                            st.markdown(
-                                f"<div style='margin-bottom: 0.5em; font-size: 1em;'>"
-                                f"<b>{manager}</b>"
-                                f"</div>",
-                                unsafe_allow_html=True,
-                            )
+    # Detect mobile state
+    is_mobile = st.session_state.get("is_mobile", False)
+    st.markdown(CUP_CSS, unsafe_allow_html=True)
+
+    # Create a tab for each stage (e.g., "Round of 32", "Quarter Final", etc.),
+    # each rendered as a single HTML block
+    tabs = st.tabs([stage_view["stage"] for stage_view in view_model])
+    for tab, stage_view in zip(tabs, view_model):
+        with tab:
+            st.markdown(stage_html(stage_view, is_mobile), unsafe_allow_html=True)
@@ -1,5 +1,6 @@
 import streamlit as st
-import pandas as pd
+import data_loader
+from instrumentation import timed
 
 
 def ordinal(n):
@@ -11,16 +12,16 @@ def ordinal(n):
     return f"{n}{suffix}"
 
 
-@st.cache_data(ttl=60)
 def load_prize_fund():
-    """Load prize fund data with caching"""
-    return pd.read_csv("prize_fund.csv")
+    """Load prize fund data from the shared cache"""
+    return data_loader.load_prize_fund()
 
 
 def show_prizes_page():
     """Display the prizes page content side by side"""
     st.title("Prize Fund 💵")
-    df = load_prize_fund()
+    with timed("page/prizes/load"):
+        df = load_prize_fund()
     col1, col2, col3 = st.columns(3)
 
     # Main League Prizes
@@ -0,0 +1,23 @@
+import streamlit as st
+
+
+def show_lazy_sections(sections, key):
+    """Tab-like sections where only the selected one is computed and rendered.
+
+    sections maps each label to a function drawing that section. Unlike st.tabs,
+    the other sections' code doesn't run, and as the selector and the section
+    are one fragment, switching sections reruns only that fragment.
+    """
+
+    @st.fragment
+    def render_selected_section():
+        selected = st.radio(
+            "Section",
+            list(sections),
+            horizontal=True,
+            key=key,
+            label_visibility="collapsed",
+        )
+        sections[selected]()
+
+    render_selected_section()
@@ -1,42 +1,43 @@
 import streamlit as st
-import pandas as pd
-import os
+from data_loader import (
+    load_finished_gameweeks,
+    load_league_table,
+    load_live_scores,
+    load_top_finishes,
+)
+from instrumentation import timed
+from league_analytics import CHIP_MAPPING
+from streamlit_pages.sections import show_lazy_sections
 
 
-@st.cache_data(ttl=60)
 def get_finished_gameweeks():
-    """Get list of finished gameweeks from the gameweek info CSV."""
+    """Get list of finished gameweeks from the gameweek info table."""
     try:
-        if os.path.exists("data/gameweek_info.csv"):
-            gw_info = pd.read_csv("data/gameweek_info.csv")
-            if not gw_info.empty and "finished_events" in gw_info.columns:
-                finished_str = gw_info["finished_events"].iloc[0]
-                # Convert to string to handle numpy types and NaN values
-                finished_str = str(finished_str) if pd.notna(finished_str) else ""
-                if finished_str.strip() and finished_str.strip() != "nan":
-                    return [int(x) for x in finished_str.split(",")]
-                else:
-                    # Empty string means no finished gameweeks yet - this is valid
-                    return []
-        # If file doesn't exist, return None to indicate we couldn't determine status
-        return None
+        # None means the file doesn't exist, so we couldn't determine status;
+        # an empty list means no finished gameweeks yet - this is valid
+        return load_finished_gameweeks()
     except Exception as e:
         st.warning(f"Could not load gameweek info: {e}")
         return None
 
 
-def show_weekly_winner_page(df_weekly_scores, selected_user):
+def show_weekly_winner_page(selected_user):
     """Display the weekly winner page content"""
     st.title("Weekly Winner")
 
     # Get list of finished gameweeks
-    finished_gameweeks = get_finished_gameweeks()
+    with timed("page/weekly_winner/load"):
+        finished_gameweeks = get_finished_gameweeks()
+        df_live = get_live_scores(finished_gameweeks)
+
+    # Provisional standings of the gameweek in progress
+    if not df_live.empty:
+        show_live_scores(df_live, selected_user)
     
     # Handle different cases
     if finished_gameweeks is None:
         # Could not determine gameweek status
         st.warning("Could not determine which gameweeks are finished. Showing all data.")
-        df_completed = df_weekly_scores
     elif len(finished_gameweeks) == 0:
         # No gameweeks are finished yet
         st.info("No completed gameweeks yet. Weekly winners will appear once gameweeks are finished.")
@@ -47,32 +48,75 @@ def show_weekly_winner_page(df_weekly_scores, selected_user):
             st.info(f"Showing winners for completed gameweek: {finished_gameweeks[0]}")
         else:
             st.info(f"Showing winners for completed gameweeks: 1-{max(finished_gameweeks)}")
-        df_completed = df_weekly_scores[df_weekly_scores["event"].isin(finished_gameweeks)]
-        if df_completed.empty:
+        # Winners are only computed from completed gameweeks, so none means no data
+        with timed("page/weekly_winner/load"):
+            no_completed_data = load_league_table("weekly_winners").empty
+        if no_completed_data:
             st.info("No data available for completed gameweeks.")
             return
 
-    df_weekly_winner = df_completed[
-        df_completed["points"]
-        == df_completed.groupby("event")["points"].transform("max")
-    ]
-    df_weekly_winner = df_weekly_winner.sort_values(by="event")[
-        ["event", "player_name", "points"]
-    ]
-    event_counts = df_weekly_winner.groupby("event")["player_name"].transform("count")
+    # Only the selected section is loaded and rendered
+    show_lazy_sections(
+        {
+            "📅 Weekly Winner": lambda: show_weekly_winners(selected_user),
+            "🎖️ Total Weekly Prizes": lambda: show_weekly_prizes(selected_user),
+            "🌟 Top 5 Finishes": lambda: show_top_finishes(selected_user),
+        },
+        key="weekly_winner_section",
+    )
+
+
+def get_live_scores(finished_gameweeks):
+    """Live scores of the gameweek in progress; empty once that gameweek is finished."""
+    df_live = load_live_scores()
+    if df_live.empty or finished_gameweeks is None:
+        return df_live
+    return df_live[~df_live["event"].isin(finished_gameweeks)]
+
+
+def show_live_scores(df_live, selected_user):
+    event = df_live["event"].iloc[0]
+    st.subheader(f"⏱️ Live Gameweek {event}")
+    st.caption("Provisional points so far, before automatic substitutions and bonus changes.")
+
+    with timed("page/weekly_winner/render"):
+        df_live = df_live.assign(
+            active_chip=df_live["active_chip"].astype(str).map(CHIP_MAPPING).fillna("")
+        )
+        config_columns = {
+            "rank": st.column_config.NumberColumn("#", width=40),
+            "player_name": st.column_config.TextColumn("Manager", width=150),
+            "net_points": st.column_config.NumberColumn("Points", width=80),
+            "event_transfers_cost": st.column_config.NumberColumn("Hits", width=60),
+            "points_on_bench": st.column_config.NumberColumn("Bench", width=60),
+            "active_chip": st.column_config.TextColumn("Chip", width=80),
+        }
+
+        st.dataframe(
+            df_live[list(config_columns)].style.apply(highlight_user(selected_user), axis=1),
+            hide_index=True,
+            column_config=config_columns,
+            use_container_width=False,
+        )
 
-    # Assign £10 / number of winners for each row
-    df_weekly_winner["prize"] = 10 / event_counts
 
-    # Styling function
+# Styling function
+def highlight_user(selected_user):
     def highlight_row(row):
         if row["player_name"] == selected_user:
             return ["background-color: #cce5ff"] * len(row)  # light blue
         else:
             return [""] * len(row)
 
-    tab1, tab2, tab3 = st.tabs(["📅 Weekly Winner", "🎖️ Total Weekly Prizes", "🌟 Top 5 Finishes"])
-    with tab1:
+    return highlight_row
+
+
+def show_weekly_winners(selected_user):
+    # Winners are precomputed by initial_setup.py
+    with timed("page/weekly_winner/load"):
+        df_weekly_winner = load_league_table("weekly_winners")
+
+    with timed("page/weekly_winner/render"):
         config_columns = {
             "event": st.column_config.NumberColumn("Gameweek"),
             "player_name": st.column_config.TextColumn("Manager"),
@@ -81,19 +125,19 @@ def show_weekly_winner_page(df_weekly_scores, selected_user):
         }
 
         st.dataframe(
-            df_weekly_winner.style.apply(highlight_row, axis=1),
+            df_weekly_winner.style.apply(highlight_user(selected_user), axis=1),
             hide_index=True,
             column_config=config_columns,
             use_container_width=False,
         )
-    with tab2:
-        df_weekly_prizes = (
-            df_weekly_winner.groupby("player_name")["prize"].sum().reset_index()
-        )
 
-        # Sort by total winnings in descending order
-        df_weekly_prizes = df_weekly_prizes.sort_values(by="prize", ascending=False)
 
+def show_weekly_prizes(selected_user):
+    # Sorted by total winnings in descending order
+    with timed("page/weekly_winner/load"):
+        df_weekly_prizes = load_league_table("weekly_prizes")
+
+    with timed("page/weekly_winner/render"):
         config_columns = {
             "player_name": st.column_config.TextColumn("Manager", width=150),
             "prize": st.column_config.NumberColumn(
@@ -102,78 +146,46 @@ def show_weekly_winner_page(df_weekly_scores, selected_user):
         }
 
         st.dataframe(
-            df_weekly_prizes.style.apply(highlight_row, axis=1),
+            df_weekly_prizes.style.apply(highlight_user(selected_user), axis=1),
             hide_index=True,
             column_config=config_columns,
             use_container_width=False,
         )
 
-    with tab3:
-        st.subheader(f"🌟 {selected_user}'s Top 5 Finishes")
-        
-        # Find gameweeks where selected user finished in top 5
-        my_top_weeks = []
-        
-        for event in df_completed["event"].unique():
-            event_data = df_completed[df_completed["event"] == event].copy()
-            event_data = event_data.sort_values("points", ascending=False).reset_index(drop=True)
-            
-            # Add proper rank column (handles ties correctly)
-            event_data["rank"] = event_data["points"].rank(method="min", ascending=False).astype(int)
-            
-            # Get the 5th highest score to determine cutoff (including ties)
-            if len(event_data) >= 5:
-                fifth_highest_score = event_data.iloc[4]["points"]
-                top_5_data = event_data[event_data["points"] >= fifth_highest_score]
-            else:
-                # If less than 5 players, take all
-                top_5_data = event_data
-            
-            # Check if selected user is in this top group
-            user_in_top = top_5_data[top_5_data["player_name"] == selected_user]
-            if not user_in_top.empty:
-                # Store this gameweek data
-                my_top_weeks.append({
-                    "event": event,
-                    "my_rank": user_in_top.iloc[0]["rank"],
-                    "my_points": user_in_top.iloc[0]["points"],
-                    "top_5_data": top_5_data
-                })
-        
-        if my_top_weeks:
-            # Sort by gameweek
-            my_top_weeks.sort(key=lambda x: x["event"])
-            
-            top5_count = 0
-            for week_data in my_top_weeks:
-                top5_count += 1
-                event = week_data["event"]
-                my_rank = week_data["my_rank"]
-                my_points = week_data["my_points"]
-                top_5_data = week_data["top_5_data"]
-                
-                with st.expander(f"📈 Gameweek {event} - Finished #{my_rank} with {my_points} points", expanded=(top5_count==1)):
-                    # Highlight function for this specific gameweek
-                    def highlight_my_row(row):
-                        if row["player_name"] == selected_user:
-                            return ["background-color: #cce5ff"] * len(row)  # light blue
-                        else:
-                            return [""] * len(row)
-                    
-                    config_columns = {
-                        "rank": st.column_config.NumberColumn("#", width=40),
-                        "player_name": st.column_config.TextColumn("Manager", width=150),
-                        "points": st.column_config.NumberColumn("Points", width=80),
-                    }
-                    
-                    display_data = top_5_data[["rank", "player_name", "points"]]
-                    
-                    st.dataframe(
-                        display_data.style.apply(highlight_my_row, axis=1),
-                        hide_index=True,
-                        column_config=config_columns,
-                        use_container_width=False,
-                        height=(len(display_data) + 1) * 35 + 3
-                    )
-        else:
-            st.info(f"No top 5 finishes found for {selected_user}.")
+
+def show_top_finishes(selected_user):
+    st.subheader(f"🌟 {selected_user}'s Top 5 Finishes")
+
+    # Gameweeks where the selected user finished in the top 5, and the
+    # top 5 (including ties) of each of those gameweeks
+    with timed("page/weekly_winner/transform"):
+        my_top_weeks, top_groups = load_top_finishes(selected_user)
+        top_5_by_event = dict(tuple(top_groups.groupby("event"))) if not my_top_weeks.empty else {}
+
+    if my_top_weeks.empty:
+        st.info(f"No top 5 finishes found for {selected_user}.")
+        return
+
+    config_columns = {
+        "rank": st.column_config.NumberColumn("#", width=40),
+        "player_name": st.column_config.TextColumn("Manager", width=150),
+        "points": st.column_config.NumberColumn("Points", width=80),
+    }
+    with timed("page/weekly_winner/render"):
+        for i, week_data in enumerate(my_top_weeks.itertuples(index=False)):
+            event = week_data.event
+            top_5_data = top_5_by_event[event]
+
+            with st.expander(
+                f"📈 Gameweek {event} - Finished #{week_data.rank} with {week_data.points} points",
+                expanded=(i == 0),
+            ):
+                display_data = top_5_data[["rank", "player_name", "points"]]
+
+                st.dataframe(
+                    display_data.style.apply(highlight_user(selected_user), axis=1),
+                    hide_index=True,
+                    column_config=config_columns,
+                    use_container_width=False,
+                    height=(len(display_data) + 1) * 35 + 3
+                )
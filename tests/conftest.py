@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The modules live at the repository root rather than in a package, and the
+# offline FPL API stand-in under benchmarks/
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+
+def make_weekly_scores(entries=(1, 2, 3, 4), events=(1, 2, 3)):
+    """Weekly scores with a tie at the top of every gameweek but the first."""
+    rows = []
+    for event in events:
+        points_by_entry = {entry_id: 40 + 10 * ((entry_id + event) % len(entries)) for entry_id in entries}
+        if event > 1:
+            # The first manager ties with the gameweek's top score
+            points_by_entry[entries[0]] = max(points_by_entry[entry_id] for entry_id in entries[1:])
+        for entry_id, points in points_by_entry.items():
+            rows.append(
+                {
+                    "entry_id": entry_id,
+                    "player_name": f"Manager {entry_id}",
+                    "team_name": f"Team {entry_id}",
+                    "event": event,
+                    "points": points,
+                    "total_points": 0,
+                }
+            )
+    df = pd.DataFrame(rows)
+    df["total_points"] = df.groupby("entry_id")["points"].cumsum()
+    return df
+
+
+@pytest.fixture
+def weekly_scores():
+    return make_weekly_scores()
@@ -0,0 +1,87 @@
+import os
+
+import pandas as pd
+import pytest
+
+import league_db
+from archive import archive_dir, archive_season, archived_seasons, save_alltime_tables
+from data_store import read_table, write_table
+from league_analytics import build_league_tables
+
+FINISHED_EVENTS = [1, 2]
+
+
+@pytest.fixture
+def source_dir(tmp_path, weekly_scores):
+    directory = tmp_path / "source"
+    write_table(weekly_scores, "weekly_scores", directory, csv=False)
+    write_table(
+        pd.DataFrame({"current_event": [3], "finished_events": ["1,2"], "season": ["2025-26"]}),
+        "gameweek_info",
+        directory,
+        csv=False,
+    )
+    return directory
+
+
+def test_archive_season_without_a_league_database(tmp_path, source_dir, weekly_scores):
+    data_dir = tmp_path / "data"
+
+    assert archive_season("2025-26", source_dir, data_dir)
+
+    season_dir = os.path.join(archive_dir(data_dir), "2025-26")
+    # The derived tables the source lacked are built
+    assert len(read_table("event_ranks", season_dir)) == 2 * weekly_scores["entry_id"].nunique()
+    summary = read_table("season_summary", season_dir)
+    assert summary["gameweeks"].tolist() == [2, 2, 2, 2]
+    assert summary["weekly_prizes"].sum() == 20
+    assert archived_seasons(data_dir) == ["2025-26"]
+
+
+def test_league_database_gives_the_same_summary(tmp_path, source_dir, weekly_scores):
+    archive_season("2025-26", source_dir, tmp_path / "pandas")
+    # As the ingest leaves it: derived tables and league.db next to the raw ones
+    tables = build_league_tables(weekly_scores, pd.DataFrame(), pd.DataFrame(), FINISHED_EVENTS)
+    write_table(tables["weekly_winners"], "weekly_winners", source_dir, csv=False)
+    league_db.build_database([weekly_scores], FINISHED_EVENTS, source_dir)
+
+    archive_season("2025-26", source_dir, tmp_path / "sql")
+
+    pd.testing.assert_frame_equal(
+        read_table("season_summary", os.path.join(archive_dir(tmp_path / "sql"), "2025-26")),
+        read_table("season_summary", os.path.join(archive_dir(tmp_path / "pandas"), "2025-26")),
+    )
+
+
+def test_archive_season_replaces_a_copy_left_by_a_crashed_run(tmp_path, source_dir):
+    data_dir = tmp_path / "data"
+    archive_season("2025-26", source_dir, data_dir)
+    season_dir = os.path.join(archive_dir(data_dir), "2025-26")
+    os.makedirs(os.path.join(f"{season_dir}.old", "leftover"))
+
+    assert archive_season("2025-26", source_dir, data_dir)
+
+    assert not os.path.exists(f"{season_dir}.old")
+    assert archived_seasons(data_dir) == ["2025-26"]
+
+
+def test_archive_season_needs_weekly_scores(tmp_path):
+    os.makedirs(tmp_path / "empty")
+    assert not archive_season("2025-26", tmp_path / "empty", tmp_path / "data")
+    assert archived_seasons(tmp_path / "data") == []
+
+
+def test_save_alltime_tables_adds_up_every_season(tmp_path, source_dir):
+    data_dir = tmp_path / "data"
+    archive_season("2024-25", source_dir, data_dir)
+    archive_season("2025-26", source_dir, data_dir)
+    # Without a summary a directory isn't an archived season
+    os.makedirs(os.path.join(archive_dir(data_dir), "2023-24"))
+
+    save_alltime_tables(data_dir)
+
+    assert read_table("alltime_seasons", data_dir)["season"].unique().tolist() == ["2024-25", "2025-26"]
+    df_managers = read_table("alltime_managers", data_dir)
+    assert (df_managers["seasons"] == 2).all()
+    assert (df_managers["gameweeks"] == 4).all()
+    assert df_managers["weekly_prizes"].sum() == 40
@@ -0,0 +1,50 @@
+from checkpoint import CrawlJournal
+
+
+def test_start_resumes_only_the_same_crawl(tmp_path):
+    journal = CrawlJournal(tmp_path)
+    assert not journal.start(1, "gw20")
+    journal.record_batch(1, 0, [(10, "history", 0), (11, "history", 0)])
+    journal.close()
+
+    journal = CrawlJournal(tmp_path)
+    assert journal.start(1, "gw20")
+    assert journal.done_entries(1) == {10, 11}
+    assert journal.saved_parts(1) == {0}
+
+    # A new gameweek discards the stale progress
+    assert not journal.start(1, "gw21")
+    assert journal.done_entries(1) == set()
+    journal.close()
+
+
+def test_units_are_tracked_per_league_and_endpoint(tmp_path):
+    journal = CrawlJournal(tmp_path)
+    journal.start(1, "gw20")
+    journal.start(2, "gw20")
+    journal.record_batch(1, 0, [(10, "history", 0), (10, "picks", 20)])
+    journal.record_batch(1, 1, [(11, "history", 0)])
+    journal.record_batch(2, 0, [(20, "history", 0)])
+
+    assert journal.done_entries(1) == {10, 11}
+    assert journal.done_entries(1, "picks") == {10}
+    assert journal.saved_parts(1) == {0, 1}
+    assert journal.done_entries(2) == {20}
+    journal.close()
+
+
+def test_finish_forgets_a_league(tmp_path):
+    journal = CrawlJournal(tmp_path)
+    journal.start(1, "gw20")
+    journal.start(2, "gw20")
+    journal.record_batch(1, 0, [(10, "history", 0)])
+    journal.mark_compacted(1, "weekly_scores")
+    journal.mark_compacted(2, "chip_usage")
+
+    journal.finish(1)
+
+    assert journal.done_entries(1) == set()
+    assert journal.compacted_tables(1) == set()
+    assert journal.compacted_tables(2) == {"chip_usage"}
+    assert not journal.start(1, "gw20")
+    journal.close()
@@ -0,0 +1,157 @@
+import os
+
+import pandas as pd
+
+from data_store import (
+    CURRENT_NAME,
+    begin_ingest,
+    compact_parts,
+    current_version,
+    end_ingest,
+    ingest_in_progress,
+    latest_data_dir,
+    part_paths,
+    publish_snapshot,
+    read_table,
+    refresh_dir,
+    snapshot_path,
+    table_path,
+    write_part,
+    write_table,
+)
+
+
+def set_mtime(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+def test_compact_parts_combines_parts_in_order(tmp_path, weekly_scores):
+    for part, (_, df) in enumerate(weekly_scores.groupby("event")):
+        write_part(df, "weekly_scores", part, tmp_path)
+
+    assert compact_parts("weekly_scores", tmp_path, csv=False)
+
+    df = read_table("weekly_scores", tmp_path)
+    assert df["event"].tolist() == weekly_scores["event"].tolist()
+    assert df["entry_id"].tolist() == weekly_scores["entry_id"].tolist()
+    assert part_paths("weekly_scores", tmp_path) == []
+
+
+def test_compact_parts_keeps_only_the_given_events_and_entries(tmp_path, weekly_scores):
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+    df_new = weekly_scores[weekly_scores["event"] == 3].assign(points=99)
+    write_part(df_new, "weekly_scores", 0, tmp_path)
+
+    # Gameweek 3 is refetched, and manager 4 has left the league
+    assert compact_parts("weekly_scores", tmp_path, keep_events=[1, 2], keep_entries=[1, 2, 3], csv=False)
+
+    df = read_table("weekly_scores", tmp_path)
+    kept = df[df["event"] < 3]
+    assert sorted(kept["entry_id"].unique()) == [1, 2, 3]
+    assert (df.loc[df["event"] == 3, "points"] == 99).all()
+    assert len(df) == 2 * 3 + len(df_new)
+
+
+def test_compact_parts_without_parts_keeps_the_table(tmp_path, weekly_scores):
+    # e.g. a rerun after a crash between removing the parts and recording the compaction
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+
+    assert not compact_parts("weekly_scores", tmp_path, keep_events=[1], csv=False)
+    assert len(read_table("weekly_scores", tmp_path)) == len(weekly_scores)
+
+
+def test_write_part_is_atomic(tmp_path, weekly_scores):
+    write_part(weekly_scores, "weekly_scores", 7, tmp_path)
+
+    (path,) = part_paths("weekly_scores", tmp_path)
+    assert os.path.basename(path) == "part-00007.parquet"
+    assert not [file for file in os.listdir(os.path.dirname(path)) if file.endswith(".tmp")]
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(path)[["entry_id", "points"]].astype("int64"),
+        weekly_scores[["entry_id", "points"]],
+    )
+
+
+def test_published_snapshots_keep_their_tables(tmp_path, weekly_scores):
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+    first = publish_snapshot(tmp_path)
+    write_table(weekly_scores.head(1), "weekly_scores", tmp_path, csv=False)
+    second = publish_snapshot(tmp_path)
+
+    assert current_version(tmp_path) == second
+    assert len(read_table("weekly_scores", snapshot_path(first, tmp_path))) == len(weekly_scores)
+    assert len(read_table("weekly_scores", snapshot_path(second, tmp_path))) == 1
+
+
+def test_publish_snapshot_deletes_the_oldest(tmp_path, weekly_scores):
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+    versions = [publish_snapshot(tmp_path, keep=2) for _ in range(3)]
+
+    assert sorted(os.listdir(tmp_path / "snapshots")) == versions[1:]
+
+
+def test_latest_data_dir_picks_the_newest_copy(tmp_path, weekly_scores):
+    assert latest_data_dir(tmp_path) == tmp_path
+
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+    version = publish_snapshot(tmp_path)
+    flat_table = table_path("weekly_scores", tmp_path)
+    set_mtime(flat_table, 1000)
+    set_mtime(tmp_path / CURRENT_NAME, 1000)
+    # Ties go to the snapshot
+    assert latest_data_dir(tmp_path) == snapshot_path(version, tmp_path)
+
+    # Complete tables written since, e.g. by a git pull, with no ingest running
+    set_mtime(flat_table, 2000)
+    assert not ingest_in_progress(tmp_path)
+    assert latest_data_dir(tmp_path) == tmp_path
+
+    # A refresh published after that
+    work_dir = refresh_dir(tmp_path)
+    write_table(weekly_scores, "weekly_scores", work_dir, csv=False)
+    refreshed = publish_snapshot(work_dir)
+    set_mtime(os.path.join(work_dir, CURRENT_NAME), 3000)
+    assert latest_data_dir(tmp_path) == snapshot_path(refreshed, work_dir)
+
+
+def test_tables_of_an_ingest_in_progress_are_never_read(tmp_path, weekly_scores):
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+    write_table(pd.DataFrame({"current_event": [3]}), "gameweek_info", tmp_path, csv=False)
+    version = publish_snapshot(tmp_path)
+    set_mtime(tmp_path / CURRENT_NAME, 1000)
+
+    begin_ingest(tmp_path)
+    write_table(weekly_scores.head(1), "weekly_scores", tmp_path, csv=False)
+    # Newer than CURRENT, but the gameweek info isn't written yet
+    assert latest_data_dir(tmp_path) == snapshot_path(version, tmp_path)
+
+    end_ingest(tmp_path)
+    assert latest_data_dir(tmp_path) == tmp_path
+    new_version = publish_snapshot(tmp_path)
+    assert latest_data_dir(tmp_path) == snapshot_path(new_version, tmp_path)
+
+
+def test_a_failed_ingest_keeps_its_tables_hidden(tmp_path, weekly_scores):
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+    version = publish_snapshot(tmp_path)
+    set_mtime(tmp_path / CURRENT_NAME, 1000)
+    begin_ingest(tmp_path)
+    write_table(weekly_scores.head(1), "weekly_scores", tmp_path, csv=False)
+
+    # Until the next ingest completes
+    assert ingest_in_progress(tmp_path)
+    assert latest_data_dir(tmp_path) == snapshot_path(version, tmp_path)
+    begin_ingest(tmp_path)
+    end_ingest(tmp_path)
+    assert latest_data_dir(tmp_path) == tmp_path
+
+
+def test_latest_data_dir_ignores_the_league_database(tmp_path, weekly_scores):
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+    version = publish_snapshot(tmp_path)
+    set_mtime(table_path("weekly_scores", tmp_path), 1000)
+    set_mtime(tmp_path / CURRENT_NAME, 1000)
+
+    # Rebuilt on load, which doesn't make the tables newer
+    (tmp_path / "league.db").write_bytes(b"")
+    assert latest_data_dir(tmp_path) == snapshot_path(version, tmp_path)
@@ -0,0 +1,157 @@
+import json
+import os
+
+import pytest
+
+import fpl_cache
+from fpl_cache import CachedResponse, cached_get, get_ttl, set_finished_events
+
+BASE_URL = "https://fantasy.premierleague.com/api"
+
+
+class FakeFetch:
+    """Stand-in for requests.get recording the requests made."""
+
+    def __init__(self, status_code=200, content=b"{}", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.calls = []
+
+    def __call__(self, url, headers=None):
+        self.calls.append((url, headers or {}))
+        return CachedResponse(url, self.status_code, self.content, self.headers)
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(fpl_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(fpl_cache, "OFFLINE", False)
+    monkeypatch.setattr(fpl_cache, "_cache_size", None)
+    set_finished_events([])
+    yield
+    set_finished_events([])
+
+
+def age_entry(url, seconds):
+    """Make a cached response look fetched seconds earlier."""
+    meta, _ = fpl_cache._read_entry(url)
+    meta["fetched_at"] -= seconds
+    fpl_cache._write_atomic(fpl_cache._paths(url)[0], json.dumps(meta).encode())
+
+
+@pytest.mark.parametrize(
+    "path, ttl",
+    [
+        ("/bootstrap-static/", 5 * 60),
+        ("/leagues-classic/43344/standings/?page_standings=2", fpl_cache.CURRENT_EVENT_TTL),
+        ("/leagues-h2h-matches/league/3023235/?page=1&event=5", fpl_cache.CURRENT_EVENT_TTL),
+        ("/entry/1/history/", fpl_cache.CURRENT_EVENT_TTL),
+        ("/entry/1/event/5/picks/", 5 * 60),
+        ("/event/5/live/", fpl_cache.LIVE_TTL),
+        ("/fixtures/", fpl_cache.DEFAULT_TTL),
+    ],
+)
+def test_ttl_rules(path, ttl):
+    assert get_ttl(BASE_URL + path) == ttl
+
+
+def test_finished_gameweeks_never_expire():
+    set_finished_events([4, 5])
+    assert get_ttl(f"{BASE_URL}/entry/1/event/5/picks/") is None
+    assert get_ttl(f"{BASE_URL}/event/4/live/") is None
+    assert get_ttl(f"{BASE_URL}/leagues-h2h-matches/league/3023235/?page=1&event=5") is None
+    assert get_ttl(f"{BASE_URL}/event/6/live/") == fpl_cache.LIVE_TTL
+    # Not tied to a gameweek
+    assert get_ttl(f"{BASE_URL}/entry/1/history/") == fpl_cache.CURRENT_EVENT_TTL
+
+
+def test_fresh_responses_are_served_from_the_cache():
+    url = f"{BASE_URL}/bootstrap-static/"
+    fetch = FakeFetch(content=b'{"events": []}')
+
+    assert cached_get(url, fetch).json() == {"events": []}
+    response = cached_get(url, fetch)
+
+    assert len(fetch.calls) == 1
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.json() == {"events": []}
+
+
+def test_finished_gameweek_responses_are_never_refetched():
+    url = f"{BASE_URL}/event/5/live/"
+    set_finished_events([5])
+    fetch = FakeFetch()
+    cached_get(url, fetch)
+    age_entry(url, 365 * 24 * 60 * 60)
+
+    assert cached_get(url, fetch).headers["X-Cache"] == "HIT"
+    assert len(fetch.calls) == 1
+
+
+def test_stale_responses_are_revalidated():
+    url = f"{BASE_URL}/bootstrap-static/"
+    etag = {"ETag": '"v1"', "Last-Modified": "Sat, 18 Oct 2026 12:00:00 GMT"}
+    cached_get(url, FakeFetch(content=b'{"v": 1}', headers=etag))
+    age_entry(url, 10 * 60)
+
+    not_modified = FakeFetch(status_code=304, content=b"")
+    response = cached_get(url, not_modified)
+
+    assert not_modified.calls[0][1] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Sat, 18 Oct 2026 12:00:00 GMT",
+    }
+    assert response.headers["X-Cache"] == "REVALIDATED"
+    assert response.json() == {"v": 1}
+    # Fresh again after the revalidation
+    assert cached_get(url, not_modified).headers["X-Cache"] == "HIT"
+    assert len(not_modified.calls) == 1
+
+
+def test_changed_responses_replace_the_cached_one():
+    url = f"{BASE_URL}/bootstrap-static/"
+    cached_get(url, FakeFetch(content=b'{"v": 1}'))
+    age_entry(url, 10 * 60)
+
+    assert cached_get(url, FakeFetch(content=b'{"v": 2}')).json() == {"v": 2}
+    assert cached_get(url, FakeFetch()).json() == {"v": 2}
+
+
+def test_errors_are_not_cached():
+    url = f"{BASE_URL}/entry/1/history/"
+    assert cached_get(url, FakeFetch(status_code=503)).status_code == 503
+
+    fetch = FakeFetch()
+    cached_get(url, fetch)
+    assert len(fetch.calls) == 1
+
+
+def test_offline_serves_stale_responses_and_misses_with_504(monkeypatch):
+    url = f"{BASE_URL}/bootstrap-static/"
+    cached_get(url, FakeFetch(content=b'{"v": 1}'))
+    age_entry(url, 24 * 60 * 60)
+    monkeypatch.setattr(fpl_cache, "OFFLINE", True)
+    fetch = FakeFetch()
+
+    assert cached_get(url, fetch).json() == {"v": 1}
+    miss = cached_get(f"{BASE_URL}/entry/1/history/", fetch)
+    assert miss.status_code == 504
+    assert miss.headers["X-Cache"] == "MISS"
+    assert fetch.calls == []
+
+
+def test_least_recently_used_responses_are_evicted(monkeypatch):
+    monkeypatch.setattr(fpl_cache, "MAX_CACHE_BYTES", 250)
+    urls = [f"{BASE_URL}/entry/{entry_id}/history/" for entry_id in range(3)]
+    for mtime, url in enumerate(urls[:2]):
+        cached_get(url, FakeFetch(content=b"x" * 100))
+        body_path = fpl_cache._paths(url)[1]
+        os.utime(body_path, (1000 + mtime, 1000 + mtime))
+    # Reading the oldest marks it as recently used
+    cached_get(urls[0], FakeFetch())
+
+    cached_get(urls[2], FakeFetch(content=b"x" * 100))
+
+    cached = [fpl_cache._read_entry(url)[0] is not None for url in urls]
+    assert cached == [True, False, True]
@@ -0,0 +1,100 @@
+import pytest
+from fake_fpl import PAGE_SIZE, FakeFPL, install
+
+import fpl_cache
+import fpl_client
+import initial_setup
+from data_store import ingest_in_progress, latest_data_dir
+from initial_setup import JAGER_CUP_LEAGUE_ID, LEAGUE_ID, get_h2h_matches, ingest, parse_args
+
+
+def test_chip_periods_from_the_command_line():
+    assert parse_args(["--chip-period", "1-10", "--chip-period", "11-38"]).chip_periods == [(1, 10), (11, 38)]
+    assert parse_args([]).chip_periods is None
+
+
+@pytest.mark.parametrize("periods", [["1-"], ["10-1"], ["1-20", "20-38"]])
+def test_invalid_chip_periods_are_rejected(periods):
+    argv = [arg for period in periods for arg in ("--chip-period", period)]
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+
+@pytest.fixture
+def fake_api(tmp_path, monkeypatch):
+    """Install an offline FPL API for a test, restoring the real client afterwards."""
+    monkeypatch.setattr(fpl_client, "_client", None)
+    monkeypatch.setattr(fpl_cache, "CACHE_DIR", fpl_cache.CACHE_DIR)
+    monkeypatch.setattr(fpl_cache, "_cache_size", None)
+
+    def install_fake(fake):
+        return install(fake, cache_dir=str(tmp_path / "cache"))
+
+    return install_fake
+
+
+def cup(managers):
+    return FakeFPL(managers=managers, current_event=22, cup_league_id=JAGER_CUP_LEAGUE_ID)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3, 8])
+@pytest.mark.parametrize("managers", [2, 51, 150, 1000])
+def test_get_h2h_matches_collects_every_page_once(fake_api, managers, max_workers):
+    fake = cup(managers)
+    fake_api(fake)
+
+    assert get_h2h_matches(JAGER_CUP_LEAGUE_ID, max_workers=max_workers) == fake.cup_matches()
+
+
+@pytest.mark.parametrize("max_workers", [1, 3, 8])
+@pytest.mark.parametrize("managers", [2, 150, 1000])
+def test_get_h2h_matches_of_one_gameweek(fake_api, managers, max_workers):
+    fake = cup(managers)
+    fake_api(fake)
+
+    for event in sorted({match["event"] for match in fake.cup_matches()}):
+        expected = [match for match in fake.cup_matches() if match["event"] == event]
+        assert get_h2h_matches(JAGER_CUP_LEAGUE_ID, event, max_workers) == expected
+
+
+@pytest.mark.parametrize("max_workers", [1, 3, 8])
+def test_get_h2h_matches_keeps_the_pages_before_a_missing_one(fake_api, monkeypatch, max_workers):
+    fake = cup(1000)
+    h2h_matches = fake.h2h_matches
+    # Page 4 still claims a next page, which isn't found
+    monkeypatch.setattr(
+        fake,
+        "h2h_matches",
+        lambda league_id, page, event=None: h2h_matches(league_id, page, event) if page <= 4 else None,
+    )
+    fake_api(fake)
+
+    assert get_h2h_matches(JAGER_CUP_LEAGUE_ID, max_workers=max_workers) == fake.cup_matches()[: 4 * PAGE_SIZE]
+
+
+def test_get_h2h_matches_of_an_unknown_league(fake_api):
+    fake_api(cup(10))
+    assert get_h2h_matches(1, max_workers=3) is None
+
+
+def test_ingest_publishes_only_complete_tables(fake_api, tmp_path, monkeypatch):
+    data_dir = str(tmp_path / "data")
+    fake_api(FakeFPL(managers=30, current_event=20, league_id=LEAGUE_ID, cup_league_id=JAGER_CUP_LEAGUE_ID))
+    ingest(data_dir=data_dir, live=False)
+    published = latest_data_dir(data_dir)
+    assert published != data_dir
+
+    # Midway through the next ingest, readers stay on the last snapshot
+    seen = []
+    save_league_tables = initial_setup.save_league_tables
+
+    def save_and_look(*args, **kwargs):
+        seen.append(latest_data_dir(data_dir))
+        save_league_tables(*args, **kwargs)
+
+    monkeypatch.setattr(initial_setup, "save_league_tables", save_and_look)
+    ingest(data_dir=data_dir, live=False)
+
+    assert seen == [published]
+    assert not ingest_in_progress(data_dir)
+    assert latest_data_dir(data_dir) not in (published, data_dir)
@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+
+from league_analytics import (
+    SEASON_SUMMARY_COLUMNS,
+    alltime_summary,
+    build_league_tables,
+    completed_scores,
+    event_ranks,
+    manager_season_stats,
+    season_summary,
+    weekly_winners,
+)
+
+
+def cup_match(event, stage, player_1, player_2, winner, is_bye=False):
+    return {
+        "event": event,
+        "stage": stage,
+        "entry_1_id": player_1,
+        "entry_1_player_name": f"Manager {player_1}",
+        "entry_2_id": player_2,
+        "entry_2_player_name": f"Manager {player_2}",
+        "winner": winner,
+        "is_bye": is_bye,
+    }
+
+
+@pytest.fixture
+def summary(weekly_scores):
+    finished_events = [1, 2]
+    df_completed = completed_scores(weekly_scores, finished_events)
+    df_cup = pd.DataFrame(
+        [
+            cup_match(1, "Semi-final", 1, 2, 1),
+            cup_match(1, "Semi-final", 3, 4, None, is_bye=True),
+            cup_match(2, "Final", 1, 3, 3),
+            # Not finished yet, so not counted
+            cup_match(3, "Final", 2, 4, 4),
+        ]
+    )
+    return season_summary(
+        "2025-26",
+        weekly_winners(df_completed),
+        manager_season_stats(event_ranks(df_completed), top_n=1),
+        df_cup,
+        finished_events,
+    ).set_index("player_name")
+
+
+def test_season_summary_counts_every_manager(summary):
+    assert summary.columns.tolist() == [column for column in SEASON_SUMMARY_COLUMNS if column != "player_name"]
+    assert (summary["season"] == "2025-26").all()
+    assert summary["gameweeks"].tolist() == [2, 2, 2, 2]
+    assert summary.loc["Manager 1", "points"] == 120
+    assert summary.loc["Manager 2", "best_gameweek"] == 70
+
+
+def test_season_summary_splits_tied_weekly_prizes(summary):
+    # Manager 2 won gameweek 1, and managers 1 and 4 tied in gameweek 2
+    assert summary["weekly_wins"].to_dict() == {
+        "Manager 1": 1,
+        "Manager 2": 1,
+        "Manager 3": 0,
+        "Manager 4": 1,
+    }
+    assert summary["weekly_prizes"].to_dict() == {
+        "Manager 1": 5.0,
+        "Manager 2": 10.0,
+        "Manager 3": 0.0,
+        "Manager 4": 5.0,
+    }
+    assert summary["top_finishes"].to_dict() == summary["weekly_wins"].to_dict()
+
+
+def test_season_summary_counts_finished_cup_matches_only(summary):
+    assert summary["cup_match_wins"].to_dict() == {
+        "Manager 1": 1,
+        "Manager 2": 0,
+        "Manager 3": 1,
+        "Manager 4": 0,
+    }
+    assert summary["cup_titles"].to_dict() == {
+        "Manager 1": 0,
+        "Manager 2": 0,
+        "Manager 3": 1,
+        "Manager 4": 0,
+    }
+
+
+def test_alltime_summary_adds_up_seasons(summary):
+    df_seasons = pd.concat(
+        [summary.reset_index(), summary.reset_index().assign(season="2024-25")], ignore_index=True
+    )
+
+    df_alltime = alltime_summary(df_seasons)
+
+    # Highest weekly prizes first, then points
+    assert df_alltime["player_name"].tolist() == ["Manager 2", "Manager 1", "Manager 4", "Manager 3"]
+    row = df_alltime.set_index("player_name").loc["Manager 1"]
+    assert row["seasons"] == 2
+    assert row["gameweeks"] == 4
+    assert row["points"] == 240
+    assert row["best_gameweek"] == 60
+    assert row["weekly_prizes"] == 10.0
+    assert row["cup_match_wins"] == 2
+
+
+def test_build_league_tables_uses_the_given_chip_periods(weekly_scores):
+    df_chips = pd.DataFrame(
+        {"player_name": ["Manager 1", "Manager 2"], "event": [2, 3], "chip": ["wildcard", "bboost"]}
+    )
+
+    tables = build_league_tables(weekly_scores, df_chips, pd.DataFrame(), [1, 2, 3], [(1, 2), (3, 38)])
+
+    df_summary = tables["chip_summary"].set_index("Manager")
+    assert df_summary.columns.tolist() == ["Rank", "total_points", "Chips GW 1-2", "Chips GW 3-38"]
+    assert df_summary.loc["Manager 1", "Chips GW 1-2"] == "🔄"
+    assert df_summary.loc["Manager 2", "Chips GW 3-38"] == "🚀"
@@ -0,0 +1,100 @@
+import os
+from contextlib import closing
+
+import pandas as pd
+import pytest
+
+import league_db
+from data_store import write_table
+from league_analytics import (
+    completed_scores,
+    event_ranks,
+    manager_season_stats,
+    top_finishes,
+    weekly_winners,
+)
+
+FINISHED_EVENTS = [1, 2]
+
+
+@pytest.fixture
+def conn(tmp_path, weekly_scores):
+    # Built in two batches, as the streaming ingest does
+    batches = [weekly_scores[weekly_scores["event"] == 1], weekly_scores[weekly_scores["event"] > 1]]
+    assert league_db.build_database(batches, FINISHED_EVENTS, tmp_path) == len(weekly_scores)
+    with closing(league_db.connect(league_db.db_path(tmp_path))) as conn:
+        yield conn
+
+
+@pytest.mark.parametrize("player_name", ["Manager 1", "Manager 3", "Nobody"])
+@pytest.mark.parametrize("top_n", [1, 2])
+def test_top_finishes_matches_pandas(conn, weekly_scores, player_name, top_n):
+    df_event_ranks = event_ranks(completed_scores(weekly_scores, FINISHED_EVENTS))
+    expected_weeks, expected_groups = top_finishes(df_event_ranks, player_name, top_n)
+
+    my_weeks, top_groups = league_db.top_finishes(conn, player_name, top_n)
+
+    pd.testing.assert_frame_equal(my_weeks, expected_weeks, check_dtype=False)
+    expected_groups = expected_groups.sort_values(
+        ["event", "points", "player_name"], ascending=[True, False, True]
+    ).reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        top_groups, expected_groups, check_dtype=False, check_index_type=False
+    )
+
+
+def test_manager_season_stats_matches_pandas(conn, weekly_scores):
+    df_event_ranks = event_ranks(completed_scores(weekly_scores, FINISHED_EVENTS))
+    expected = manager_season_stats(df_event_ranks, top_n=1)
+
+    pd.testing.assert_frame_equal(
+        league_db.manager_season_stats(conn, top_n=1), expected, check_dtype=False
+    )
+
+
+def test_top_scores_give_the_same_weekly_winners(conn, weekly_scores):
+    expected = weekly_winners(completed_scores(weekly_scores, FINISHED_EVENTS))
+    pd.testing.assert_frame_equal(
+        weekly_winners(league_db.top_scores(conn)), expected, check_dtype=False
+    )
+
+
+def test_unknown_finished_events_count_every_gameweek(tmp_path, weekly_scores):
+    league_db.build_database([weekly_scores], None, tmp_path)
+    with closing(league_db.connect(league_db.db_path(tmp_path))) as conn:
+        events = league_db.top_scores(conn)["event"].unique().tolist()
+    assert events == sorted(weekly_scores["event"].unique())
+
+
+def test_latest_name_of_a_manager_wins(tmp_path, weekly_scores):
+    renamed = weekly_scores.assign(
+        player_name=weekly_scores["player_name"].where(weekly_scores["event"] < 3, "Renamed")
+    )
+    league_db.build_database(league_db_batches(renamed), FINISHED_EVENTS, tmp_path)
+    with closing(league_db.connect(league_db.db_path(tmp_path))) as conn:
+        assert league_db.manager_names(conn) == ["Renamed"]
+
+
+def league_db_batches(df):
+    return [df[df["event"] == event] for event in sorted(df["event"].unique())]
+
+
+def test_database_is_rebuilt_from_the_parquet_tables(tmp_path, weekly_scores):
+    data_loader = pytest.importorskip("data_loader")
+    write_table(weekly_scores, "weekly_scores", tmp_path, csv=False)
+    write_table(
+        pd.DataFrame({"current_event": [3], "finished_events": ["1,2"], "season": ["2025-26"]}),
+        "gameweek_info",
+        tmp_path,
+        csv=False,
+    )
+
+    path, version = data_loader.league_db_version(str(tmp_path))
+
+    assert version is not None
+    with closing(league_db.connect(path)) as conn:
+        assert len(league_db.managers(conn)) == weekly_scores["entry_id"].nunique()
+        assert league_db.top_scores(conn)["event"].unique().tolist() == FINISHED_EVENTS
+    # Not rebuilt again while it is newer than the weekly scores
+    assert data_loader.league_db_version(str(tmp_path))[1] == version
+    assert not os.path.exists(f"{path}.tmp")
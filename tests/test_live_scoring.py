@@ -0,0 +1,86 @@
+import numpy as np
+
+from live_scoring import live_element_points, live_leaderboard, live_scores, picks_table
+
+
+def picks_payload(elements, captain, chip=None, transfers_cost=0):
+    bench_multiplier = 1 if chip == "bboost" else 0
+    return {
+        "active_chip": chip,
+        "entry_history": {"event_transfers_cost": transfers_cost},
+        "picks": [
+            {
+                "position": position,
+                "element": element,
+                "multiplier": (2 if element == captain else 1) if position <= 11 else bench_multiplier,
+                "is_captain": element == captain,
+            }
+            for position, element in enumerate(elements, start=1)
+        ],
+    }
+
+
+def live_payload(points_by_element):
+    return {
+        "elements": [
+            {"id": element, "stats": {"total_points": points}}
+            for element, points in points_by_element.items()
+        ]
+    }
+
+
+def test_live_element_points_indexes_by_element_id():
+    points = live_element_points(live_payload({3: 7, 1: 2}))
+    assert points.tolist() == [0, 2, 0, 7]
+    assert live_element_points({"elements": []}).tolist() == [0]
+
+
+def test_live_scores_applies_multipliers_bench_and_transfers():
+    squad = list(range(1, 16))
+    df_picks = picks_table(
+        {
+            10: picks_payload(squad, captain=1, transfers_cost=4),
+            20: picks_payload(squad, captain=2, chip="bboost"),
+            30: None,  # Picks not available
+        },
+        event=5,
+    )
+    # Every player scores 1, except 1 and 2
+    element_points = live_element_points(live_payload({element: 1 for element in squad} | {1: 10, 2: 6}))
+
+    df_live = live_scores(df_picks, element_points).set_index("entry_id")
+
+    assert df_live.index.tolist() == [10, 20]
+    # 20 for the captain, 6 and 9 more starters at 1 point
+    assert df_live.loc[10, "points"] == 20 + 6 + 9
+    assert df_live.loc[10, "net_points"] == 20 + 6 + 9 - 4
+    # 12 for the captain, 10 and 9 more starters, then a bench of four 1s
+    assert df_live.loc[20, "points"] == 12 + 10 + 9 + 4
+    assert (df_live["points_on_bench"] == 4).all()
+    assert df_live.loc[20, "active_chip"] == "bboost"
+
+
+def test_live_scores_ignores_players_missing_from_the_live_data():
+    df_picks = picks_table({10: picks_payload([99] + list(range(2, 16)), captain=2)}, event=5)
+    df_live = live_scores(df_picks, np.array([0, 0, 3], dtype=np.int64))
+    assert df_live["points"].tolist() == [6]
+
+
+def test_live_leaderboard_ranks_ties_together():
+    squad = list(range(1, 16))
+    df_picks = picks_table(
+        {entry_id: picks_payload(squad, captain=captain) for entry_id, captain in [(1, 1), (2, 1), (3, 2)]},
+        event=5,
+    )
+    df_live = live_scores(df_picks, live_element_points(live_payload({1: 5, 2: 1})))
+    entries = [
+        {"entry": 1, "player_name": "zoe smith", "entry_name": "Z"},
+        {"entry": 2, "player_name": "adam jones", "entry_name": "A"},
+        {"entry": 3, "player_name": "bea brown", "entry_name": "B"},
+        {"entry": 4, "player_name": "no picks", "entry_name": "N"},
+    ]
+
+    df_board = live_leaderboard(df_live, entries)
+
+    assert df_board["player_name"].tolist() == ["Adam Jones", "Zoe Smith", "Bea Brown"]
+    assert df_board["rank"].tolist() == [1, 1, 3]